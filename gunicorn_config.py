@@ -5,20 +5,38 @@ Usage: gunicorn -c gunicorn_config.py linkedin_scraper.wsgi:application
 
 import multiprocessing
 import os
+import sys
+
+# gthread keeps every request and background task on a real OS thread, which the
+# asyncio scraping pipeline (asyncio.run + to_thread) needs. gevent is opt-in only.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+# With preload_app the app (requests, ssl, gspread...) is imported in the master before
+# the gevent worker would patch the stdlib, so patch here, ahead of any of those imports.
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
 
 # Server Socket
 bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
 backlog = 2048
 
 # Worker Processes
-workers = multiprocessing.cpu_count() * 2 + 1  # Recommended formula
-worker_class = 'sync'  # 'gevent' or 'eventlet' for async
+# Each worker serves `threads` requests at once (or up to `worker_connections` greenlets
+# under gevent), so the sync-era `2 * cores + 1` formula over-provisions processes
+# for this I/O-bound app.
+workers = multiprocessing.cpu_count() + 1
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
 worker_connections = 1000
 max_requests = 1000  # Restart workers after this many requests (prevents memory leaks)
 max_requests_jitter = 50
 timeout = 120  # Worker timeout (seconds) - increase for long-running scraping tasks
 keepalive = 5
 
+# Import Django, pandas, gspread and the static manifest once in the master and share
+# them copy-on-write with every forked worker instead of loading them per worker.
+preload_app = True
+
 # Logging
 accesslog = '-'  # Log to stdout
 errorlog = '-'   # Log to stderr
@@ -54,10 +72,34 @@ def on_starting(server):
 def on_reload(server):
     """Called to recycle workers during a reload."""
     server.log.info("Reloading Gunicorn server...")
+    # Resumes may have been replaced on disk; drop any bytes cached in this process.
+    messenger_services = sys.modules.get('messenger.services')
+    if messenger_services is not None:
+        messenger_services.clear_resume_cache()
 
 def when_ready(server):
     """Called just after the server is started."""
     server.log.info(f"Gunicorn server ready. Listening on: {bind}")
+    _warm_master_caches(server)
+
+def _warm_master_caches(server):
+    """
+    Fills process-wide caches in the master so forked workers inherit them.
+    Only disk reads and imports happen here: sockets (Google Sheets, SMTP, Inboxino)
+    must be opened after the fork, so the RateLimiterService is not warmed here.
+    """
+    if not preload_app:
+        return
+    from django.conf import settings
+    from messenger.services import load_resume
+    import scraper.views  # noqa: F401  (pulls in pandas, gspread and the Apify client)
+
+    for filename in settings.PRELOAD_RESUME_FILENAMES:
+        try:
+            load_resume(filename)
+            server.log.info(f"Preloaded resume '{filename}'")
+        except FileNotFoundError:
+            server.log.warning(f"Resume '{filename}' not found; it will be loaded on first send")
 
 def pre_fork(server, worker):
     """Called just before a worker is forked."""
@@ -70,6 +70,22 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+# Task status and scrape caches are shared through Redis when REDIS_URL is set, so every
+# gunicorn worker sees the same tasks; the local-memory fallback is per-process (dev only).
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -110,8 +126,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Static Files Storage (Production Optimization)
 # ==============================================================================
 # WhiteNoise configuration for efficient static file serving
+# collectstatic writes pre-compressed .gz copies, plus .br copies when the 'Brotli' package is installed
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Cache non-hashed files for a year in production (hashed manifest files are always cached forever)
+WHITENOISE_MAX_AGE = 0 if DEBUG else 31536000
+# Serve from STATIC_ROOT only in production instead of searching the app directories per request
+WHITENOISE_USE_FINDERS = DEBUG
+
 # ==============================================================================
 # Security Settings (Production)
 # ==============================================================================
@@ -145,6 +167,10 @@ LOGGING = {
     'formatters': {'verbose': {'format': '{levelname} {asctime} {module} {message}', 'style': '{'}},
     'handlers': {'console': {'class': 'logging.StreamHandler', 'formatter': 'verbose'}},
     'root': {'handlers': ['console'], 'level': 'INFO'},
+    # The rate limiter logs once per sender check and per send; keep that chatter out of production logs.
+    'loggers': {
+        'messenger.rate_limiter_service': {'level': os.getenv('RATE_LIMITER_LOG_LEVEL', 'WARNING')},
+    },
 }
 
 # ==============================================================================
@@ -157,9 +183,12 @@ EMAIL_USE_SSL = os.getenv('MAIL_USE_SSL', 'False') == 'True'
 
 MAIL_FROM_NAME = os.getenv('MAIL_FROM_NAME', 'Mirza Agency')
 INBOXINO_API_URL = 'https://back.inboxino.com/api/access-api/message/send'
+INBOXINO_UPLOAD_URL = 'https://dl2.inboxino.com/api/upload/file'
 EMAIL_SUBJECT_CONTENT = "Mirza AI-Automation Agency"
 WHATSAPP_MESSAGE_CONTENT = "Hello, my name is Milad. I’m a software developer, and this file contains my resume. I would be glad to collaborate with your company. ✅"
 RESUME_PDF_FILENAME = "resume.pdf"
+# Resumes read into the gunicorn master at startup (comma-separated) so forked workers share them
+PRELOAD_RESUME_FILENAMES = [f.strip() for f in os.getenv('PRELOAD_RESUME_FILENAMES', RESUME_PDF_FILENAME).split(',') if f.strip()]
 EMAIL_COLUMN_NAME = "emails"
 PHONE_COLUMN_NAME = "phones"
 EMAIL_STATUS_COLUMN = "email_status"
@@ -168,6 +197,18 @@ WHATSAPP_STATUS_COLUMN = "whatsapp_status"
 # --- Default status for messaging columns after scraping ---
 PENDING_STATUS = "Pending"
 
+# --- Scraping Settings ---
+# Searches for the same country submitted in one LinkedIn actor run (1 = one run per search)
+LINKEDIN_SEARCH_BATCH_SIZE = max(1, int(os.getenv('LINKEDIN_SEARCH_BATCH_SIZE', 1)))
+# Contact-detail actor runs kept in flight at once; keep within your Apify plan's concurrent-run limit
+CONTACT_SCRAPER_CONCURRENCY = max(1, int(os.getenv('CONTACT_SCRAPER_CONCURRENCY', 8)))
+# Past this many existing links, duplicates are checked with a bloom filter if pybloom-live is installed
+LINK_BLOOM_FILTER_THRESHOLD = int(os.getenv('LINK_BLOOM_FILTER_THRESHOLD', 100000))
+
+# --- Campaign state ---
+# Local SQLite (WAL) journal of status cells not yet written to the sheet; survives crashes
+CAMPAIGN_STATE_DB = os.getenv('CAMPAIGN_STATE_DB', str(BASE_DIR / 'campaign_state.db'))
+
 # --- Rate Limiting and Sender Pool Settings ---
 SENDERS_POOL_SHEET_NAME = os.getenv('SENDERS_POOL_SHEET_NAME', 'Senders Pool')
 SENDERS_LOG_SHEET_NAME = os.getenv('SENDERS_LOG_SHEET_NAME', 'Senders Log')
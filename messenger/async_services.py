@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import aiohttp
+from django.conf import settings
+from messenger.services import ResumeAsset, SendResult, _build_whatsapp_payload
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# Async WhatsApp Service (Inboxino over aiohttp)
+# ==============================================================================
+# Used by the messenger management commands only; the Django views stay synchronous (WSGI).
+
+async def upload_file_async(session: aiohttp.ClientSession, api_key: str, resume: ResumeAsset):
+    """
+    Uploads a preloaded resume to Inboxino and returns its attachment path, or None on failure.
+    """
+    if not api_key:
+        logger.error("Inboxino API Key is required for file upload.")
+        return None
+    if not resume:
+        logger.error("A resume is required for upload.")
+        return None
+
+    form = aiohttp.FormData()
+    form.add_field('file', resume.data, filename=resume.path.name, content_type='application/pdf')
+    headers = {"Authorization": f"Bearer {api_key}", "Accept": "application/json"}
+
+    try:
+        async with session.post(settings.INBOXINO_UPLOAD_URL, headers=headers, data=form, timeout=aiohttp.ClientTimeout(total=45)) as response:
+            if response.status >= 400:
+                logger.error(f"Inboxino Upload API Error ({response.status}): {await response.text()}")
+                return None
+            response_json = await response.json()
+
+        attachment_id = response_json.get('data', {}).get('path')
+        if not attachment_id:
+            logger.error("Inboxino upload successful, but could not find 'path' key in the API response.")
+            return None
+
+        logger.info(f"File '{resume.filename}' uploaded successfully. Attachment Path: {attachment_id}")
+        return attachment_id
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Inboxino Upload Error: A network error occurred: {e}")
+        return None
+
+async def send_whatsapp_async(session: aiohttp.ClientSession, recipients_chunk: list, attachment_id: str, sender_config: dict, resume: ResumeAsset) -> SendResult:
+    """
+    Sends the resume to one chunk of phone numbers using a specific sender configuration.
+    """
+    if not recipients_chunk: return SendResult(False, "No Valid Phone Found")
+    if not attachment_id: return SendResult(False, "Failed: Missing Attachment ID")
+    if not sender_config or not sender_config.get('api_key'): return SendResult(False, "Failed: Invalid Sender Config")
+
+    sender_id = sender_config['id']
+    headers = {
+        "Authorization": f"Bearer {sender_config['api_key']}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+    payload = _build_whatsapp_payload(recipients_chunk, attachment_id, resume.filename)
+
+    try:
+        async with session.post(settings.INBOXINO_API_URL, headers=headers, json=payload, timeout=aiohttp.ClientTimeout(total=20)) as response:
+            response.raise_for_status()
+        logger.info(f"WhatsApp message sent via '{sender_id}' to {len(recipients_chunk)} number(s)")
+        return SendResult(True, f"Sent via {sender_id}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Failed to send WhatsApp message via {sender_id}: {e}")
+        return SendResult(False, f"Failed: Sending Error ({sender_id})")
+
+async def send_whatsapp_bulk_async(recipients: list, sender_config: dict, resume: ResumeAsset, chunk_size: int = 50) -> list:
+    """
+    Uploads the resume once, then sends it to every chunk of recipients concurrently.
+    All requests share one ClientSession, so its pooled TLS connections are reused.
+    Returns one SendResult per chunk.
+    """
+    if not resume:
+        return [SendResult(False, "Failed: Missing resume filename from Senders Pool")]
+
+    connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        attachment_id = await upload_file_async(session, sender_config.get('api_key'), resume)
+        if not attachment_id:
+            return [SendResult(False, f"Failed: Upload error for {resume.filename}")]
+
+        chunks = [recipients[i:i + chunk_size] for i in range(0, len(recipients), chunk_size)]
+        return await asyncio.gather(*(
+            send_whatsapp_async(session, chunk, attachment_id, sender_config, resume)
+            for chunk in chunks
+        ))
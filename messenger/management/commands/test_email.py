@@ -1,18 +1,31 @@
 import os
+import re
+import pandas as pd
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from messenger.services import send_email
+from messenger.services import load_resume, send_emails_bulk, send_emails_parallel
+from messenger.rate_limiter_service import RateLimiterService
 from scraper.services.google_sheets_service import GoogleSheetsService
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Something@domain.tld with no whitespace or extra '@' - rejects malformed cells before any SMTP attempt
+EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
 class Command(BaseCommand):
-    help = 'Reads ALL emails from the Google Sheet and sends a separate test email to each.'
+    help = 'Reads the emails from the Google Sheet and sends a separate test email to each, within the sender\'s daily limit.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Number of parallel SMTP connections to send with (default: 1, a single persistent connection).'
+        )
 
     def handle(self, *args, **kwargs):
         self.stdout.write("--- Starting Google Sheet Email Test (Loop Mode) ---")
 
+        rate_limiter = None
         try:
             # Step 1: Connect to Google Sheets
             self.stdout.write("Connecting to Google Sheets...")
@@ -25,27 +38,29 @@ class Command(BaseCommand):
 
             # Step 2: Find and read ALL valid emails from the 'emails' column
             self.stdout.write("Searching for all valid emails in the sheet...")
-            header_map = sheets_service.get_header_map(worksheet)
+            schema = sheets_service.get_schema(worksheet)
             email_column_name = settings.EMAIL_COLUMN_NAME
-            email_column_index = header_map.get(email_column_name)
+            email_column_index = schema.columns.get(email_column_name)
 
             if not email_column_index:
                 self.stdout.write(self.style.ERROR(f"Error: Column '{email_column_name}' not found in the Google Sheet."))
                 return
 
-            all_cells_in_column = worksheet.col_values(email_column_index)
+            # Fetch only the populated cells of the email column, below the header row
+            email_col_letter = schema.letters[email_column_name]
+            email_range = worksheet.get(f"{email_col_letter}2:{email_col_letter}", value_render_option='UNFORMATTED_VALUE')
+            all_cells_in_column = [row[0] for row in email_range if row]
             
-            # --- MODIFIED LOGIC ---
-            # Flatten the list by splitting comma-separated emails from each cell
-            all_individual_emails = []
-            for cell_content in all_cells_in_column[1:]:  # Skip header
-                if cell_content:
-                    # Split by comma and strip whitespace from each potential email
-                    emails_in_cell = [email.strip() for email in cell_content.split(',')]
-                    all_individual_emails.extend(emails_in_cell)
+            # Flatten comma-separated cells into one email per entry using pandas' vectorized string ops
+            emails = (
+                pd.Series(all_cells_in_column, dtype='string')
+                .str.split(',')
+                .explode()
+                .str.strip()
+            )
 
-            # Filter for valid, unique email addresses
-            recipient_list = sorted(list(set([email for email in all_individual_emails if email and '@' in email])))
+            # Filter for valid, unique email addresses, keeping sheet order
+            recipient_list = list(dict.fromkeys(emails[emails.str.fullmatch(EMAIL_RE, na=False)]))
             
             if not recipient_list:
                 self.stdout.write(self.style.ERROR(f"Error: No valid email addresses found in the '{email_column_name}' column."))
@@ -54,18 +69,51 @@ class Command(BaseCommand):
             self.stdout.write(f"Found {len(recipient_list)} unique emails. Preparing to send test emails...")
             self.stdout.write(f"Recipients: {', '.join(recipient_list)}")
 
-            # Step 3: Call the send_email function with the full list
-            result = send_email(recipient_list)
+            # Step 3: Use the first active email sender from the Senders Pool
+            rate_limiter = RateLimiterService(sheets_service)
+            email_senders = rate_limiter.get_senders_by_type('email')
+            if not email_senders:
+                self.stdout.write(self.style.ERROR("Error: No active email senders found in the 'Senders Pool' sheet."))
+                return
+            sender_config = email_senders[0]
+            if not rate_limiter.is_sender_available('email', sender_config.get('id')):
+                self.stdout.write(self.style.ERROR(f"Error: Sender '{sender_config.get('id')}' has reached its daily email limit."))
+                return
+
+            # Step 4: Send to the whole list over one SMTP connection, or one per worker thread.
+            # Recipients beyond the sender's remaining daily quota are skipped and every send is logged.
+            resume_filename = sender_config.get('resume_filename')
+            send_kwargs = {
+                'sender_config': sender_config,
+                'resume': load_resume(resume_filename) if resume_filename else None,
+                'subject': sender_config.get('email_subject'),
+                'rate_limiter': rate_limiter,
+            }
+            workers = kwargs['workers']
+            if workers > 1:
+                results = send_emails_parallel(recipient_list, max_workers=workers, **send_kwargs)
+            else:
+                results = send_emails_bulk(recipient_list, **send_kwargs)
+            failures = {recipient: result.detail for recipient, result in results.items() if not result.ok}
+            summary = f"Sent {len(results) - len(failures)}/{len(recipient_list)}"
 
-            if "Failed" in result:
-                self.stdout.write(self.style.ERROR(f"Email dispatch process completed with errors. Summary: {result}"))
+            if failures:
+                self.stdout.write(self.style.ERROR(f"Email dispatch process completed with errors. Summary: {summary}"))
+                for recipient, msg in failures.items():
+                    self.stdout.write(self.style.ERROR(f"  {recipient}: {msg}"))
                 self.stdout.write(self.style.WARNING("Please check your .env file settings and the console logs for more details."))
             else:
-                self.stdout.write(self.style.SUCCESS(f"Email sending process complete! Summary: {result}"))
+                self.stdout.write(self.style.SUCCESS(f"Email sending process complete! Summary: {summary}"))
 
+        except FileNotFoundError as e:
+            self.stdout.write(self.style.ERROR(f"Resume file not found: {e.filename}. Make sure it is in the project root."))
         except KeyError as e:
             self.stdout.write(self.style.ERROR(f"Environment variable not set: {e}. Please check your .env file."))
         except Exception as e:
             logger.error(f"An unexpected error occurred in test_email command: {e}")
             self.stdout.write(self.style.ERROR(f"An unexpected error occurred: {e}"))
+        finally:
+            if rate_limiter is not None:
+                # Writes the logged sends to the 'Senders Log' sheet so later campaigns see the used quota
+                rate_limiter.close()
 
@@ -0,0 +1,116 @@
+import asyncio
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from messenger.async_services import send_whatsapp_bulk_async
+from messenger.services import load_resume
+from messenger.rate_limiter_service import RateLimiterService
+from scraper.services.google_sheets_service import GoogleSheetsService
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Reads the phone numbers from the Google Sheet and sends the resume to them over WhatsApp concurrently, within the sender\'s daily limit.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=50,
+            help='Number of phone numbers per Inboxino send request (default: 50).'
+        )
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write("--- Starting Google Sheet WhatsApp Test (Async Mode) ---")
+
+        rate_limiter = None
+        try:
+            # Step 1: Connect to Google Sheets
+            self.stdout.write("Connecting to Google Sheets...")
+            google_sheet_id = os.environ["GOOGLE_SHEET_ID"]
+            google_service_account_path = os.environ["GOOGLE_SERVICE_ACCOUNT_PATH"]
+
+            sheets_service = GoogleSheetsService(google_service_account_path, google_sheet_id)
+            worksheet = sheets_service.get_worksheet("Sheet1")
+            self.stdout.write(self.style.SUCCESS("Successfully connected to Google Sheet."))
+
+            # Step 2: Find and read ALL valid phone numbers from the 'phones' column
+            self.stdout.write("Searching for all valid phone numbers in the sheet...")
+            schema = sheets_service.get_schema(worksheet)
+            phone_column_name = settings.PHONE_COLUMN_NAME
+            phone_column_index = schema.columns.get(phone_column_name)
+
+            if not phone_column_index:
+                self.stdout.write(self.style.ERROR(f"Error: Column '{phone_column_name}' not found in the Google Sheet."))
+                return
+
+            phone_col_letter = schema.letters[phone_column_name]
+            phone_range = worksheet.get(f"{phone_col_letter}2:{phone_col_letter}")
+
+            # Flatten comma-separated cells, keep digit-only numbers and dedupe in sheet order
+            recipient_list = list(dict.fromkeys(
+                f"+{phone}"
+                for row in phone_range if row
+                for phone in (p.strip() for p in str(row[0]).split(','))
+                if phone.isdigit()
+            ))
+
+            if not recipient_list:
+                self.stdout.write(self.style.ERROR(f"Error: No valid phone numbers found in the '{phone_column_name}' column."))
+                return
+
+            self.stdout.write(f"Found {len(recipient_list)} unique phone numbers. Preparing to send...")
+
+            # Step 3: Use the first active WhatsApp sender from the Senders Pool, within its daily quota
+            rate_limiter = RateLimiterService(sheets_service)
+            whatsapp_senders = rate_limiter.get_senders_by_type('whatsapp')
+            if not whatsapp_senders:
+                self.stdout.write(self.style.ERROR("Error: No active WhatsApp senders found in the 'Senders Pool' sheet."))
+                return
+            sender_config = whatsapp_senders[0]
+            sender_id = sender_config.get('id')
+
+            if not rate_limiter.is_sender_available('whatsapp', sender_id):
+                self.stdout.write(self.style.ERROR(f"Error: Sender '{sender_id}' has reached its daily WhatsApp limit."))
+                return
+            remaining = rate_limiter.remaining_quota('whatsapp', sender_id)
+            if len(recipient_list) > remaining:
+                self.stdout.write(self.style.WARNING(f"Sender '{sender_id}' has {remaining} send(s) left today; only the first {remaining} number(s) will be messaged."))
+                recipient_list = recipient_list[:remaining]
+
+            # Step 4: Upload once, then send all chunks concurrently over one aiohttp session
+            resume_filename = sender_config.get('resume_filename')
+            chunk_size = kwargs['chunk_size']
+            results = asyncio.run(send_whatsapp_bulk_async(
+                recipient_list,
+                sender_config=sender_config,
+                resume=load_resume(resume_filename) if resume_filename else None,
+                chunk_size=chunk_size
+            ))
+            # Results come back one per chunk, in order (a single failure if the upload failed)
+            chunks = [recipient_list[i:i + chunk_size] for i in range(0, len(recipient_list), chunk_size)]
+            for chunk, result in zip(chunks, results):
+                if result.ok:
+                    for phone in chunk:
+                        rate_limiter.log_send(sender_id, phone, 'whatsapp')
+            failures = [result.detail for result in results if not result.ok]
+            summary = f"{len(results) - len(failures)}/{len(results)} request(s) succeeded"
+
+            if failures:
+                self.stdout.write(self.style.ERROR(f"WhatsApp dispatch process completed with errors. Summary: {summary}"))
+                for msg in failures:
+                    self.stdout.write(self.style.ERROR(f"  {msg}"))
+                self.stdout.write(self.style.WARNING("Please check your .env file settings and the console logs for more details."))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"WhatsApp sending process complete! Summary: {summary}"))
+
+        except FileNotFoundError as e:
+            self.stdout.write(self.style.ERROR(f"Resume file not found: {e.filename}. Make sure it is in the project root."))
+        except KeyError as e:
+            self.stdout.write(self.style.ERROR(f"Environment variable not set: {e}. Please check your .env file."))
+        except Exception as e:
+            logger.error(f"An unexpected error occurred in test_whatsapp command: {e}")
+            self.stdout.write(self.style.ERROR(f"An unexpected error occurred: {e}"))
+        finally:
+            if rate_limiter is not None:
+                # Writes the logged sends to the 'Senders Log' sheet so later campaigns see the used quota
+                rate_limiter.close()
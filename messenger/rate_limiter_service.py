@@ -1,17 +1,32 @@
 # -*- coding: utf-8 -*-
+import atexit
 import logging
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
 import pandas as pd
+from gspread.utils import numericise_all
 from django.conf import settings
-from scraper.services.google_sheets_service import GoogleSheetsService
+from scraper.services.google_sheets_service import GoogleSheetsService, column_letter
 
 logger = logging.getLogger(__name__)
 
+USAGE_LOG_COLUMNS = ['sender_id', 'service_type', 'recipient', 'timestamp']
+# Format log_send() writes timestamps in (UTC); parsing with it skips pandas' per-row format inference
+LOG_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+# The only 'Senders Pool' columns the campaigns read; any other columns in the sheet are never fetched
+SENDER_POOL_COLUMNS = ('id', 'type', 'is_active', 'api_key', 'host', 'port', 'password', 'resume_filename', 'email_subject')
+
 class RateLimiterService:
     """
     Manages sender accounts and controls daily sending limits for each.
     This version is optimized for sequential campaigns.
     """
+    # Number of availability checks between rebuilds of the sliding 24-hour window counters
+    WINDOW_REBUILD_INTERVAL = 50
+    # Number of logged sends buffered before they are written to the 'Senders Log' sheet in one request
+    LOG_FLUSH_THRESHOLD = 25
+
     def __init__(self, sheets_service: GoogleSheetsService):
         """Initializes the service and fetches usage logs once to cache them."""
         logger.info("=" * 80)
@@ -19,6 +34,8 @@ class RateLimiterService:
         logger.info("=" * 80)
         
         self.sheets_service = sheets_service
+        # Guards the counters and buffers so senders running in worker threads can share one instance
+        self._lock = threading.RLock()
         self.senders_pool_sheet_name = settings.SENDERS_POOL_SHEET_NAME
         self.senders_log_sheet_name = settings.SENDERS_LOG_SHEET_NAME
         
@@ -26,8 +43,19 @@ class RateLimiterService:
         logger.info(f"📋 Senders Log Sheet: '{self.senders_log_sheet_name}'")
         
         self._load_limits()
-        # Cache logs to avoid reading from Google Sheets repeatedly during a campaign
+        # Resolve both worksheets once; every read and write below reuses these handles
+        self._pool_ws = self._open_worksheet(self.senders_pool_sheet_name)
+        self._log_ws = self._open_worksheet(self.senders_log_sheet_name)
+        # Sends logged during this campaign, merged into usage_df only when it is read
+        self._usage_buffer: list[tuple] = []
+        # Log rows not yet written to the 'Senders Log' sheet; flushed in batches and at exit
+        self._pending_log_rows: list[list] = []
+        self._flush_threshold = self.LOG_FLUSH_THRESHOLD
+        atexit.register(self.flush_logs)
+        # Cache the pool and logs to avoid reading from Google Sheets repeatedly during a campaign
+        self.senders_pool_df = self._get_senders_pool()
         self.usage_df = self._get_usage_logs()
+        self._rebuild_recent_counts()
         
         logger.info("✅ Rate Limiter Service initialized successfully")
         logger.info("=" * 80)
@@ -44,45 +72,108 @@ class RateLimiterService:
         logger.info(f"   📧 Email daily limit: {self.limits['email']} messages per sender")
         logger.info(f"   💬 WhatsApp daily limit: {self.limits['whatsapp']} messages per sender")
 
-    def get_senders_by_type(self, service_type: str) -> list:
+    def _open_worksheet(self, sheet_name: str):
+        """Returns the named worksheet, or None (logged) if it cannot be opened."""
+        try:
+            return self.sheets_service.get_worksheet(sheet_name)
+        except Exception as e:
+            logger.error(f"❌ Could not open the '{sheet_name}' sheet: {e}")
+            return None
+
+    @property
+    def usage_df(self) -> pd.DataFrame:
+        """The cached usage logs, with any buffered sends from this campaign merged in."""
+        with self._lock:
+            if self._usage_buffer:
+                buffered_df = pd.DataFrame(self._usage_buffer, columns=USAGE_LOG_COLUMNS).astype({'timestamp': 'datetime64[s]'})
+                self._usage_df = pd.concat([self._usage_df, buffered_df], ignore_index=True)
+                self._usage_buffer.clear()
+            return self._usage_df
+
+    @usage_df.setter
+    def usage_df(self, df: pd.DataFrame):
+        with self._lock:
+            self._usage_df = df
+            self._usage_buffer.clear()
+
+    def refresh(self):
+        """Re-reads the Senders Pool and Senders Log sheets, replacing the cached snapshots."""
+        logger.info("🔄 Refreshing cached Senders Pool and Senders Log snapshots...")
+        self._pool_ws = self._open_worksheet(self.senders_pool_sheet_name)
+        self._log_ws = self._open_worksheet(self.senders_log_sheet_name)
+        self.senders_pool_df = self._get_senders_pool()
+        self.usage_df = self._get_usage_logs()
+        self._rebuild_recent_counts()
+
+    def _rebuild_recent_counts(self):
         """
-        [NEW] Retrieves the FULL list of active sender configurations for a given service type.
-        This is used to get the entire sequence for a campaign.
+        Recounts sends per sender inside the sliding 24-hour window.
+        Availability checks read these counters instead of scanning the usage DataFrame.
+        """
+        with self._lock:
+            self._window_start = datetime.utcnow() - timedelta(hours=24)
+            usage_df = self.usage_df
+            recent_logs = usage_df[usage_df['timestamp'] >= self._window_start]
+            self._recent_counts = Counter(recent_logs['sender_id'])
+            self._checks_since_rebuild = 0
+
+    def _get_senders_pool(self) -> pd.DataFrame:
+        """
+        Retrieves all sender configurations from the 'Senders Pool' sheet as a pandas DataFrame.
+        Only the SENDER_POOL_COLUMNS are downloaded, in a single batch_get request.
         """
-        logger.info("-" * 80)
-        logger.info(f"🔍 Fetching active senders for type: '{service_type}'")
-        
         try:
-            worksheet = self.sheets_service.get_worksheet(self.senders_pool_sheet_name)
-            records = worksheet.get_all_records()
-            
-            # Filter for active senders of this type
-            active_senders = [record for record in records if record.get('type') == service_type and record.get('is_active')]
-            
-            logger.info(f"✅ Found {len(active_senders)} active {service_type} sender(s)")
-            
-            if active_senders:
-                logger.info(f"📋 Sender sequence for {service_type}:")
-                for idx, sender in enumerate(active_senders, 1):
-                    sender_id = sender.get('id', 'Unknown')
-                    logger.info(f"   {idx}. Account: {sender_id}")
-            else:
-                logger.warning(f"⚠️  No active senders found for type '{service_type}'")
-            
-            logger.info("-" * 80)
-            return active_senders
+            worksheet = self._pool_ws or self.sheets_service.get_worksheet(self.senders_pool_sheet_name)
+            headers = [header.strip() for header in worksheet.row_values(1)]
+            wanted = [(header, column_letter(i)) for i, header in enumerate(headers, 1) if header in SENDER_POOL_COLUMNS]
+            if not wanted:
+                return pd.DataFrame()
             
+            value_ranges = worksheet.batch_get([f"{letter}2:{letter}" for _, letter in wanted])
+            # Empty cells come back as [] and trailing empties are trimmed, so pad every column to the same length
+            row_count = max(len(value_range) for value_range in value_ranges)
+            columns = {}
+            for (header, _), value_range in zip(wanted, value_ranges):
+                values = [row[0] if row else '' for row in value_range]
+                values += [''] * (row_count - len(values))
+                # Same number conversion get_all_records() applies
+                columns[header] = numericise_all(values)
+            return pd.DataFrame(columns)
         except Exception as e:
             logger.error(f"❌ Could not read the '{self.senders_pool_sheet_name}' sheet: {e}")
-            logger.info("-" * 80)
-            return []
+            return pd.DataFrame()
+
+    def get_senders_by_type(self, service_type: str) -> list:
+        """
+        [NEW] Retrieves the FULL list of active sender configurations for a given service type.
+        This is used to get the entire sequence for a campaign.
+        Reads from the pool snapshot taken at initialization; call refresh() for a fresh read.
+        """
+        pool = self.senders_pool_df
+        if pool.empty or 'type' not in pool.columns or 'is_active' not in pool.columns:
+            active_senders = []
+        else:
+            # Filter for active senders of this type (any non-empty 'is_active' cell counts as active)
+            mask = (pool['type'] == service_type) & pool['is_active'].astype(bool)
+            active_senders = pool[mask].to_dict('records')
+        
+        logger.info("Found %d active %s sender(s)", len(active_senders), service_type)
+        if not active_senders:
+            logger.warning("⚠️  No active senders found for type '%s'", service_type)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("-" * 80)
+            logger.debug(f"📋 Sender sequence for {service_type}:")
+            for idx, sender in enumerate(active_senders, 1):
+                logger.debug(f"   {idx}. Account: {sender.get('id', 'Unknown')}")
+            logger.debug("-" * 80)
+        return active_senders
 
     def _get_usage_logs(self) -> pd.DataFrame:
         """Retrieves all sending logs from the 'Senders Log' sheet and returns a pandas DataFrame."""
         logger.info("📊 Loading sending history from 'Senders Log' sheet...")
         
         try:
-            worksheet = self.sheets_service.get_worksheet(self.senders_log_sheet_name)
+            worksheet = self._log_ws or self.sheets_service.get_worksheet(self.senders_log_sheet_name)
             logs = worksheet.get_all_records()
             
             if not logs:
@@ -90,8 +181,10 @@ class RateLimiterService:
                 return pd.DataFrame(columns=['sender_id', 'timestamp'])
             
             df = pd.DataFrame(logs)
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format=LOG_TIMESTAMP_FORMAT, errors='coerce')
             df_clean = df.dropna(subset=['timestamp'])
+            # Second precision is all the log carries; it halves the memory of the default ns column
+            df_clean = df_clean.astype({'timestamp': 'datetime64[s]'})
             
             # Calculate stats for last 24 hours
             twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
@@ -115,78 +208,92 @@ class RateLimiterService:
     def is_sender_available(self, service_type: str, sender_id: str) -> bool:
         """
         [NEW & CRITICAL] Checks if a SPECIFIC sender has reached its daily sending limit.
-        Uses the cached usage logs for efficiency.
+        Uses the per-sender counters built from the cached usage logs (an O(1) lookup).
         """
         if not sender_id:
             logger.warning("⚠️  No sender_id provided for availability check")
             return False
 
-        logger.info(f"🔎 Checking availability for sender: {sender_id}")
-        
-        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-        
-        # Filter the cached DataFrame
-        sender_usage = self.usage_df[
-            (self.usage_df['sender_id'] == sender_id) &
-            (self.usage_df['timestamp'] >= twenty_four_hours_ago)
-        ]
-        
-        usage_count = len(sender_usage)
+        with self._lock:
+            # Periodically slide the 24-hour window so old sends expire from the counters
+            self._checks_since_rebuild += 1
+            if self._checks_since_rebuild >= self.WINDOW_REBUILD_INTERVAL:
+                self._rebuild_recent_counts()
+            
+            usage_count = self._recent_counts.get(sender_id, 0)
         limit = self.limits.get(service_type, 0)
         remaining = limit - usage_count
 
         if usage_count < limit:
-            logger.info(f"   ✅ AVAILABLE - Account: {sender_id}")
-            logger.info(f"      📊 Usage: {usage_count}/{limit} ({remaining} remaining)")
-            logger.info(f"      ⏰ Window: Last 24 hours")
+            logger.info("Sender check: %s available (%d/%d used, %d remaining in last 24h)", sender_id, usage_count, limit, remaining)
             return True
         else:
-            logger.warning(f"   ❌ RATE LIMITED - Account: {sender_id}")
-            logger.warning(f"      📊 Usage: {usage_count}/{limit} (limit reached)")
-            logger.warning(f"      ⏸️  This sender needs to wait before sending more messages")
+            logger.warning("Sender check: %s rate-limited (%d/%d used in last 24h)", sender_id, usage_count, limit)
             return False
 
+    def remaining_quota(self, service_type: str, sender_id: str) -> int:
+        """Returns how many more sends the sender has left in the sliding 24-hour window."""
+        with self._lock:
+            usage_count = self._recent_counts.get(sender_id, 0)
+        return max(0, self.limits.get(service_type, 0) - usage_count)
+
     def log_send(self, sender_id: str, recipient: str, service_type: str):
         """
-        Logs a successful send operation to the 'Senders Log' sheet and updates the in-memory cache.
+        Logs a successful send operation and updates the in-memory cache.
+        Rows are buffered and written to the 'Senders Log' sheet in batches (see flush_logs).
         """
-        logger.info("=" * 80)
-        logger.info("📝 LOGGING SUCCESSFUL SEND")
-        logger.info(f"   📤 From Account: {sender_id}")
-        logger.info(f"   📬 To: {recipient}")
-        logger.info(f"   📋 Service: {service_type}")
+        # Keep the in-memory datetime directly (no str -> parse round trip), at the sheet's second precision
+        sent_at = datetime.utcnow().replace(microsecond=0)
+        timestamp = sent_at.strftime(LOG_TIMESTAMP_FORMAT)
+        new_log = [sender_id, service_type, recipient, timestamp]
+        
+        with self._lock:
+            # Record the send in memory to avoid re-reading the sheet during the same campaign.
+            # Appending to a list is O(1); the DataFrame is only rebuilt when usage_df is read.
+            self._usage_buffer.append((sender_id, service_type, recipient, sent_at))
+            self._recent_counts[sender_id] += 1
+            usage_count = self._recent_counts[sender_id]
+            self._pending_log_rows.append(new_log)
+            should_flush = len(self._pending_log_rows) >= self._flush_threshold
+        
+        # Calculate updated usage
+        limit = self.limits.get(service_type, 0)
+        remaining = limit - usage_count
+        logger.info("Logged %s send: %s -> %s at %s (%d/%d used, %d remaining)", service_type, sender_id, recipient, timestamp, usage_count, limit, remaining)
         
+        if should_flush:
+            self.flush_logs()
+
+    def flush_logs(self):
+        """
+        Writes all buffered log rows to the 'Senders Log' sheet in a single request.
+        Rows stay buffered if the write fails so the next flush can retry them.
+        """
+        # Take the rows out under the lock so other senders are not blocked by the network call
+        with self._lock:
+            rows, self._pending_log_rows = self._pending_log_rows, []
+        if not rows:
+            return
+        
+        pending_count = len(rows)
+        logger.info(f"   💾 Saving {pending_count} log row(s) to Google Sheets...")
         try:
-            worksheet = self.sheets_service.get_worksheet(self.senders_log_sheet_name)
-            timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-            new_log = [sender_id, service_type, recipient, timestamp]
-            
-            logger.info(f"   🕐 Timestamp: {timestamp}")
-            logger.info("   💾 Saving to Google Sheets...")
-            
-            worksheet.append_row(new_log)
-            
-            # Also update the in-memory dataframe to avoid re-reading the sheet during the same campaign
-            new_log_df = pd.DataFrame([new_log], columns=['sender_id', 'service_type', 'recipient', 'timestamp'])
-            new_log_df['timestamp'] = pd.to_datetime(new_log_df['timestamp'])
-            self.usage_df = pd.concat([self.usage_df, new_log_df], ignore_index=True)
-            
-            # Calculate updated usage
-            twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-            sender_usage = self.usage_df[
-                (self.usage_df['sender_id'] == sender_id) &
-                (self.usage_df['timestamp'] >= twenty_four_hours_ago)
-            ]
-            usage_count = len(sender_usage)
-            limit = self.limits.get(service_type, 0)
-            remaining = limit - usage_count
-            
-            logger.info(f"   ✅ Successfully logged to 'Senders Log' sheet")
-            logger.info(f"   📊 Updated usage for {sender_id}: {usage_count}/{limit} ({remaining} remaining)")
-            logger.info("=" * 80)
-            
+            # Raw v4 append: values are pre-formatted strings, so Sheets skips input parsing
+            self.sheets_service.spreadsheet.values_append(
+                f"'{self.senders_log_sheet_name}'!A:D",
+                params={'valueInputOption': 'RAW', 'insertDataOption': 'INSERT_ROWS'},
+                body={'values': rows},
+            )
+            logger.info(f"   ✅ Successfully logged {pending_count} send(s) to 'Senders Log' sheet")
         except Exception as e:
+            with self._lock:
+                self._pending_log_rows[:0] = rows
             logger.error("=" * 80)
-            logger.error(f"❌ FAILED to log send for sender '{sender_id}'")
+            logger.error(f"❌ FAILED to write {pending_count} buffered log row(s) to '{self.senders_log_sheet_name}'")
             logger.error(f"   Error: {e}")
-            logger.error("=" * 80)
\ No newline at end of file
+            logger.error("=" * 80)
+
+    def close(self):
+        """Flushes buffered log rows at the end of a campaign and drops the exit-time hook."""
+        self.flush_logs()
+        atexit.unregister(self.flush_logs)
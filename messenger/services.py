@@ -1,51 +1,98 @@
 # -*- coding: utf-8 -*-
-import os
+import functools
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives, get_connection
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ==============================================================================
+# Shared HTTP Session
+# ==============================================================================
+# One pooled keep-alive session per process, so Inboxino calls reuse their TLS
+# connections instead of paying a new handshake on every upload/send.
+# Retry only covers connection failures and idempotent methods (urllib3's default),
+# so a POST that reached the server is never re-sent.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+))
+
+# ==============================================================================
+# Resume Cache
+# ==============================================================================
+class ResumeAsset(NamedTuple):
+    """A resume file resolved and read once, ready to be attached to any number of sends."""
+    filename: str
+    path: Path
+    data: bytes
+    size: int
+
+@functools.lru_cache(maxsize=16)
+def load_resume(resume_filename: str) -> ResumeAsset:
+    """
+    Resolves a resume file in the project root and reads it once.
+    Raises FileNotFoundError if the file does not exist (failures are not cached).
+    """
+    path = Path(settings.BASE_DIR) / resume_filename
+    data = path.read_bytes()
+    return ResumeAsset(resume_filename, path, data, len(data))
+
+def clear_resume_cache():
+    """Drops all cached resumes so the next load re-reads them from disk."""
+    load_resume.cache_clear()
+
+# ==============================================================================
+# Send Results
+# ==============================================================================
+class SendResult(NamedTuple):
+    """The outcome of one send: callers branch on `ok`; `detail` is the human-readable status."""
+    ok: bool
+    detail: str
+
 # ==============================================================================
 # WhatsApp Service (Updated for dynamic resumes)
 # ==============================================================================
-def upload_file_to_inboxino(api_key: str, resume_filename: str):
+def upload_file_to_inboxino(api_key: str, resume: ResumeAsset):
     """
-    Handles uploading a specific resume file to the Inboxino server.
+    Handles uploading a preloaded resume file to the Inboxino server.
     """
     if not api_key:
         logger.error("Inboxino API Key is required for file upload.")
         return None
-    if not resume_filename:
-        logger.error("A resume filename is required for upload.")
-        return None
-
-    logger.info(f"Attempting to upload '{resume_filename}' to Inboxino...")
-    file_path = os.path.join(settings.BASE_DIR, resume_filename)
-    
-    if not os.path.exists(file_path):
-        logger.error(f"Inboxino Upload Error: The resume file '{file_path}' was not found.")
+    if not resume:
+        logger.error("A resume is required for upload.")
         return None
 
-    headers = {"Authorization": f"Bearer {api_key}", "Accept": "application/json"}
-    upload_url = 'https://dl2.inboxino.com/api/upload/file'
+    logger.info(f"Attempting to upload '{resume.filename}' to Inboxino...")
 
     try:
-        with open(file_path, 'rb') as f:
-            files = {'file': (os.path.basename(file_path), f, 'application/pdf')}
-            response = requests.post(upload_url, headers=headers, files=files, timeout=45)
-            response.raise_for_status()
-            
-            response_json = response.json()
-            attachment_id = response_json.get('data', {}).get('path')
+        # Stream the multipart body instead of letting requests encode it all up front
+        form = MultipartEncoder(fields={'file': (resume.path.name, resume.data, 'application/pdf')})
+        headers = {"Authorization": f"Bearer {api_key}", "Accept": "application/json", "Content-Type": form.content_type}
+        response = _session.post(settings.INBOXINO_UPLOAD_URL, headers=headers, data=form, timeout=45)
+        response.raise_for_status()
+        
+        response_json = response.json()
+        attachment_id = response_json.get('data', {}).get('path')
 
-            if not attachment_id:
-                logger.error("Inboxino upload successful, but could not find 'path' key in the API response.")
-                return None
-            
-            logger.info(f"File '{resume_filename}' uploaded successfully. Attachment Path: {attachment_id}")
-            return attachment_id
+        if not attachment_id:
+            logger.error("Inboxino upload successful, but could not find 'path' key in the API response.")
+            return None
+        
+        logger.info(f"File '{resume.filename}' uploaded successfully. Attachment Path: {attachment_id}")
+        return attachment_id
 
     except requests.exceptions.HTTPError as e:
         logger.error(f"Inboxino Upload API Error ({e.response.status_code}): {e.response.text}")
@@ -57,24 +104,11 @@ def upload_file_to_inboxino(api_key: str, resume_filename: str):
         logger.error(f"An unexpected error occurred during file upload to Inboxino: {e}")
         return None
 
-def send_whatsapp_message(phone_numbers_to_send: list, attachment_file_id: str, sender_config: dict, resume_filename: str):
+def _build_whatsapp_payload(phone_numbers_to_send: list, attachment_file_id: str, resume_filename: str) -> dict:
     """
-    Sends a WhatsApp message using a specific sender configuration and resume filename.
+    Builds the Inboxino message payload that sends the resume file to the given numbers.
     """
-    if not phone_numbers_to_send: return "No Valid Phone Found"
-    if not attachment_file_id: return "Failed: Missing Attachment ID"
-    if not sender_config or not sender_config.get('api_key'): return "Failed: Invalid Sender Config"
-
-    api_key = sender_config['api_key']
-    sender_id = sender_config['id']
-    logger.info(f"Sending WhatsApp message via sender '{sender_id}' to: {', '.join(phone_numbers_to_send)}")
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-    payload = {
+    return {
         "messages": [{
             "message_type": "file",
             "attachment_file": attachment_file_id,
@@ -87,37 +121,51 @@ def send_whatsapp_message(phone_numbers_to_send: list, attachment_file_id: str,
         "with_country_code": "0"
     }
 
-    try:
-        response = requests.post(settings.INBOXINO_API_URL, headers=headers, json=payload, timeout=20)
-        response.raise_for_status()
-        return f"Sent via {sender_id}"
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to send WhatsApp message via {sender_id}: {e}")
-        return f"Failed: Sending Error ({sender_id})"
+def make_whatsapp_sender(sender_config: dict, attachment_file_id: str, resume: ResumeAsset):
+    """
+    Returns a send(phone_numbers) function bound to one sender and uploaded attachment.
+    Headers and the static payload are built once; each call only swaps in the recipients,
+    so a sender function must not be shared between threads.
+    """
+    sender_id = sender_config['id']
+    headers = {
+        "Authorization": f"Bearer {sender_config['api_key']}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+    base_payload = _build_whatsapp_payload([], attachment_file_id, resume.filename)
+    sent_status = SendResult(True, f"Sent via {sender_id}")
+    failed_status = SendResult(False, f"Failed: Sending Error ({sender_id})")
 
-# ==============================================================================
-# Email Service (UPDATED FOR TLS CONNECTION)
-# ==============================================================================
-def send_email(recipient_email: str, sender_config: dict, resume_filename: str, subject: str):
+    def send(phone_numbers_to_send: list) -> SendResult:
+        if not phone_numbers_to_send: return SendResult(False, "No Valid Phone Found")
+        logger.info(f"Sending WhatsApp message via sender '{sender_id}' to: {', '.join(phone_numbers_to_send)}")
+
+        base_payload['recipients'] = phone_numbers_to_send
+        try:
+            response = _session.post(settings.INBOXINO_API_URL, headers=headers, json=base_payload, timeout=20)
+            response.raise_for_status()
+            return sent_status
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to send WhatsApp message via {sender_id}: {e}")
+            return failed_status
+
+    return send
+
+def send_whatsapp_message(phone_numbers_to_send: list, attachment_file_id: str, sender_config: dict, resume: ResumeAsset) -> SendResult:
     """
-    Sends a single email with a dynamic resume and subject, based on the sender configuration.
+    Sends a WhatsApp message using a specific sender configuration and preloaded resume.
     """
-    if not recipient_email:
-        return "No Valid Email Found"
-    if not all(k in sender_config for k in ['id', 'password', 'host', 'port']):
-        return "Failed: Invalid Sender Config"
-    if not resume_filename or not subject:
-        return "Failed: Missing resume filename or subject from Senders Pool"
+    if not phone_numbers_to_send: return SendResult(False, "No Valid Phone Found")
+    if not attachment_file_id: return SendResult(False, "Failed: Missing Attachment ID")
+    if not sender_config or not sender_config.get('api_key'): return SendResult(False, "Failed: Invalid Sender Config")
 
-    sender_id = sender_config['id']
-    logger.info(f"Preparing to send email from '{sender_id}' to '{recipient_email}' with resume '{resume_filename}' and subject '{subject}'")
-    
-    resume_path = os.path.join(settings.BASE_DIR, resume_filename)
-    if not os.path.exists(resume_path):
-        logger.error(f"Email Error: Attachment file not found at '{resume_path}'. Make sure '{resume_filename}' is in the project root.")
-        return f"Failed: Attachment '{resume_filename}' not found"
-
-    html_content = """
+    return make_whatsapp_sender(sender_config, attachment_file_id, resume)(phone_numbers_to_send)
+
+# ==============================================================================
+# Email Service (UPDATED FOR TLS CONNECTION)
+# ==============================================================================
+EMAIL_HTML_CONTENT = """
     <div style="font-family: 'Segoe UI', Arial, sans-serif; color: #333;">
       <p>Dear Hiring Manager,</p>
       <p>I am writing to express my interest in a software development role at your company. My experience in Python, Django, and automation aligns with the kind of innovative work you are doing.</p>
@@ -127,32 +175,173 @@ def send_email(recipient_email: str, sender_config: dict, resume_filename: str,
       <p>A Professional Developer</p>
     </div>
     """
-    
+
+def _get_smtp_connection(sender_config: dict):
+    """
+    Builds an SMTP connection for the given sender configuration.
+    """
+    # --- CRITICAL FIX: Added use_tls from settings ---
+    return get_connection(
+        host=sender_config['host'],
+        port=sender_config['port'],
+        username=sender_config['id'],
+        password=sender_config['password'],
+        use_tls=settings.EMAIL_USE_TLS, # This enables STARTTLS for Port 587
+        use_ssl=settings.EMAIL_USE_SSL
+    )
+
+def _build_email(recipient_email: str, sender_id: str, subject: str, resume: ResumeAsset, connection) -> EmailMultiAlternatives:
+    """
+    Builds the outreach email with its HTML body and the resume attached.
+    """
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body="Please find my resume attached.",
+        from_email=f"{settings.MAIL_FROM_NAME} <{sender_id}>",
+        to=[recipient_email],
+        connection=connection
+    )
+    email.attach_alternative(EMAIL_HTML_CONTENT, "text/html")
+    # Same guess attach_file() makes from the filename, so non-PDF resumes keep their type
+    email.attach(resume.path.name, resume.data, mimetypes.guess_type(resume.filename)[0] or 'application/octet-stream')
+    return email
+
+def send_email(recipient_email: str, sender_config: dict, resume: ResumeAsset, subject: str) -> SendResult:
+    """
+    Sends a single email with a preloaded resume and dynamic subject, based on the sender configuration.
+    """
+    if not recipient_email:
+        return SendResult(False, "No Valid Email Found")
+    if not all(k in sender_config for k in ['id', 'password', 'host', 'port']):
+        return SendResult(False, "Failed: Invalid Sender Config")
+    if not resume or not subject:
+        return SendResult(False, "Failed: Missing resume filename or subject from Senders Pool")
+
+    sender_id = sender_config['id']
+    logger.info(f"Preparing to send email from '{sender_id}' to '{recipient_email}' with resume '{resume.filename}' and subject '{subject}'")
+
     try:
-        # --- CRITICAL FIX: Added use_tls from settings ---
-        connection = get_connection(
-            host=sender_config['host'],
-            port=sender_config['port'],
-            username=sender_id,
-            password=sender_config['password'],
-            use_tls=settings.EMAIL_USE_TLS, # This enables STARTTLS for Port 587
-            use_ssl=settings.EMAIL_USE_SSL
-        )
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body="Please find my resume attached.",
-            from_email=f"{settings.MAIL_FROM_NAME} <{sender_id}>",
-            to=[recipient_email],
-            connection=connection
-        )
-        email.attach_alternative(html_content, "text/html")
-        email.attach_file(resume_path)
-        
+        email = _build_email(recipient_email, sender_id, subject, resume, _get_smtp_connection(sender_config))
         email.send(fail_silently=False)
         logger.info(f"Successfully sent email from '{sender_id}' to '{recipient_email}'")
-        return f"Sent via {sender_id}"
+        return SendResult(True, f"Sent via {sender_id}")
 
     except Exception as e:
         logger.error(f"Failed to send email from {sender_id} to {recipient_email}: {e}")
-        return f"Failed: Sending Error ({sender_id})"
+        return SendResult(False, f"Failed: Sending Error ({sender_id})")
+
+def _within_quota(recipient_list: list, sender_id: str, rate_limiter) -> tuple:
+    """
+    Splits recipients into those the sender may still email today and a dict of skipped results.
+    Without a rate limiter every recipient is allowed.
+    """
+    if rate_limiter is None:
+        return recipient_list, {}
+    remaining = rate_limiter.remaining_quota('email', sender_id)
+    if len(recipient_list) > remaining:
+        logger.warning(f"Sender '{sender_id}' has {remaining} email(s) left today; skipping {len(recipient_list) - remaining} recipient(s)")
+    skipped = {recipient: SendResult(False, f"Skipped: {sender_id} rate-limited") for recipient in recipient_list[remaining:]}
+    return recipient_list[:remaining], skipped
+
+def send_emails_bulk(recipient_list: list, sender_config: dict, resume: ResumeAsset, subject: str, rate_limiter=None) -> dict:
+    """
+    Sends the same email to every recipient over ONE persistent SMTP connection.
+    The TLS handshake and AUTH are paid once per sender instead of once per recipient.
+    With a RateLimiterService, recipients beyond the sender's remaining daily quota are
+    skipped and every successful send is logged.
+    Returns a dict mapping each recipient to its SendResult.
+    """
+    if not recipient_list:
+        return {}
+    if not all(k in sender_config for k in ['id', 'password', 'host', 'port']):
+        return {recipient: SendResult(False, "Failed: Invalid Sender Config") for recipient in recipient_list}
+    if not resume or not subject:
+        return {recipient: SendResult(False, "Failed: Missing resume filename or subject from Senders Pool") for recipient in recipient_list}
+
+    sender_id = sender_config['id']
+    to_send, results = _within_quota(recipient_list, sender_id, rate_limiter)
+    logger.info(f"Preparing bulk send from '{sender_id}' to {len(to_send)} recipient(s) with resume '{resume.filename}' and subject '{subject}'")
+    if not to_send:
+        return results
+
+    try:
+        # The context manager opens the connection once and closes it after the last recipient.
+        with _get_smtp_connection(sender_config) as connection:
+            for recipient_email in to_send:
+                try:
+                    email = _build_email(recipient_email, sender_id, subject, resume, connection)
+                    email.send(fail_silently=False)
+                    logger.info(f"Successfully sent email from '{sender_id}' to '{recipient_email}'")
+                    results[recipient_email] = SendResult(True, f"Sent via {sender_id}")
+                    if rate_limiter is not None:
+                        rate_limiter.log_send(sender_id, recipient_email, 'email')
+                except Exception as e:
+                    logger.error(f"Failed to send email from {sender_id} to {recipient_email}: {e}")
+                    results[recipient_email] = SendResult(False, f"Failed: Sending Error ({sender_id})")
+    except Exception as e:
+        logger.error(f"Failed to open SMTP connection for {sender_id}: {e}")
+
+    for recipient_email in recipient_list:
+        results.setdefault(recipient_email, SendResult(False, f"Failed: Sending Error ({sender_id})"))
+    return results
+
+def send_emails_parallel(recipient_list: list, sender_config: dict, resume: ResumeAsset, subject: str, max_workers: int = 8, rate_limiter=None) -> dict:
+    """
+    Sends the same email to every recipient from a pool of worker threads.
+    smtplib connections are not thread-safe, so each worker opens its own persistent
+    SMTP connection once and reuses it for all the recipients it handles.
+    With a RateLimiterService, the recipients are capped at the sender's remaining daily
+    quota before any worker starts, and workers log each successful send (log_send is thread-safe).
+    Returns a dict mapping each recipient to its SendResult.
+    """
+    if not recipient_list:
+        return {}
+    if not all(k in sender_config for k in ['id', 'password', 'host', 'port']):
+        return {recipient: SendResult(False, "Failed: Invalid Sender Config") for recipient in recipient_list}
+    if not resume or not subject:
+        return {recipient: SendResult(False, "Failed: Missing resume filename or subject from Senders Pool") for recipient in recipient_list}
+
+    sender_id = sender_config['id']
+    to_send, skipped = _within_quota(recipient_list, sender_id, rate_limiter)
+    logger.info(f"Preparing parallel send from '{sender_id}' to {len(to_send)} recipient(s) using up to {max_workers} worker(s)")
+    if not to_send:
+        return skipped
+
+    worker_state = threading.local()
+    open_connections = []
+    connections_lock = threading.Lock()
+
+    def _open_worker_connection():
+        connection = _get_smtp_connection(sender_config)
+        connection.open()
+        worker_state.connection = connection
+        with connections_lock:
+            open_connections.append(connection)
+
+    def _send_one(recipient_email: str):
+        try:
+            email = _build_email(recipient_email, sender_id, subject, resume, worker_state.connection)
+            email.send(fail_silently=False)
+            logger.info(f"Successfully sent email from '{sender_id}' to '{recipient_email}'")
+            if rate_limiter is not None:
+                rate_limiter.log_send(sender_id, recipient_email, 'email')
+            return recipient_email, SendResult(True, f"Sent via {sender_id}")
+        except Exception as e:
+            logger.error(f"Failed to send email from {sender_id} to {recipient_email}: {e}")
+            return recipient_email, SendResult(False, f"Failed: Sending Error ({sender_id})")
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_send)), initializer=_open_worker_connection) as executor:
+            results = dict(executor.map(_send_one, to_send))
+    except Exception as e:
+        # A worker that cannot open its SMTP connection breaks the whole pool
+        logger.error(f"Parallel email send from {sender_id} aborted: {e}")
+    finally:
+        for connection in open_connections:
+            connection.close()
 
+    results.update(skipped)
+    for recipient_email in recipient_list:
+        results.setdefault(recipient_email, SendResult(False, f"Failed: Sending Error ({sender_id})"))
+    return results
@@ -1,10 +1,116 @@
+import asyncio
 import logging
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import httpx
+import orjson
+import requests
 from apify_client import ApifyClient
 
 logger = logging.getLogger(__name__)
 
+APIFY_API_BASE_URL = "https://api.apify.com/v2"
+ACTOR_RUN_TERMINAL_STATUSES = {'SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT'}
+DATASET_PAGE_SIZE = 1000
+# Attempts per dataset page before a stream is given up as failed
+DATASET_PAGE_ATTEMPTS = 4
+# Full-jitter retry backoff; the base keeps the average wait at the old 5s/10s/20s ladder
+RETRY_BACKOFF_BASE = 2.5
+RETRY_BACKOFF_CAP = 60
+
+def _backoff_seconds(attempt: int) -> float:
+    """Returns a random delay in [0, min(cap, base * 2^attempt)] so parallel retries spread out."""
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+# Apify's published API rate limit per resource
+APIFY_REQUESTS_PER_SECOND = 30
+
+def _linkedin_search_input(search_urls: list, max_results: int) -> dict:
+    """
+    Returns the search part of the LinkedIn actor input for one or more search URLs.
+    Batching searches into one run pays the actor's cold start once instead of per search.
+    """
+    if len(search_urls) == 1:
+        return {"search_url": search_urls[0], "max_results": max_results}
+    # 'startUrls' covers actors that read the standard Apify key instead of 'search_urls'
+    return {
+        "search_urls": search_urls,
+        "startUrls": [{"url": url} for url in search_urls],
+        "max_results": max_results * len(search_urls),
+    }
+
+def _contact_scraper_input(website_url: str, memory_mbytes: int, max_concurrency: int, max_depth: int, max_requests: int) -> dict:
+    """
+    Logs the contact scraper settings and builds its actor input.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("")
+        logger.info("=" * 80)
+        logger.info("📧 CONTACT DETAIL SCRAPER")
+        logger.info("=" * 80)
+        logger.info("🌐 Target Website: %s", website_url)
+        logger.info("🔍 Max Depth: %s levels", max_depth)
+        logger.info("📄 Max Requests: %s pages", max_requests)
+        logger.info("🔒 Same Domain Only: Yes")
+        logger.info("🖼️  Include Frames: Yes")
+        logger.info("⚙️  Max Concurrency: %s", max_concurrency)
+        logger.info("💾 Memory Allocated: %s MB", memory_mbytes)
+        logger.info("=" * 80)
+
+    return {
+        "startUrls": [{"url": website_url, "method": "GET"}],
+        "maxDepth": max_depth,
+        "maxRequests": max_requests,
+        "sameDomain": True,
+        "considerChildFrames": True,
+        # concurrency to reduce RAM (if actor supports it)
+        "maxConcurrency": max_concurrency,
+        # reduce extras
+        "saveScreenshots": False,
+        "debugMode": False,
+        # Additional stability settings
+        "ignoreSslErrors": True,  # Handle SSL certificate issues
+        "maxRequestRetries": 3,  # Retry failed requests within the actor
+    }
+
+def _log_contact_results(website_url: str, results: list):
+    """
+    Logs a summary of what the contact scraper found.
+    """
+    if results:
+        logger.info("=" * 80)
+        logger.info("✅ CONTACT SCRAPING COMPLETED")
+        logger.info("   Data records found: %s", len(results))
+
+        # Show summary of what was found
+        if len(results) > 0:
+            first_result = results[0]
+            emails = first_result.get('emails', [])
+            phones = first_result.get('phones', [])
+            socials = []
+            for key in ['linkedIns', 'twitters', 'facebooks', 'instagrams']:
+                if first_result.get(key):
+                    socials.append(key)
+
+            logger.info("   📧 Emails found: %s", len(emails))
+            logger.info("   📱 Phones found: %s", len(phones))
+            logger.info("   🔗 Social media: %s types", len(socials))
+        logger.info("=" * 80)
+    else:
+        logger.warning("=" * 80)
+        logger.warning("⚠️  NO CONTACT DETAILS FOUND")
+        logger.warning("   Website: %s", website_url)
+        logger.warning("   Possible reasons:")
+        logger.warning("   - Website doesn't have contact information")
+        logger.warning("   - Contact info is behind forms/login")
+        logger.warning("   - Website is blocking scrapers")
+        logger.warning("=" * 80)
+
+
 class ApifyService:
     """
     This class is responsible for all interactions with the Apify API.
@@ -19,9 +125,12 @@ class ApifyService:
             logger.error("❌ Apify API token is missing!")
             raise ValueError("Apify API token is required.")
         
-        logger.info("🔐 API token provided (length: {})".format(len(api_token)))
+        logger.info("🔐 API token provided (length: %s)", len(api_token))
         logger.info("🌐 Creating Apify client...")
         self.client = ApifyClient(api_token)
+        # Plain REST session for paged dataset reads
+        self._http = requests.Session()
+        self._http.headers["Authorization"] = f"Bearer {api_token}"
         logger.info("✅ Apify client created successfully")
 
         # Actor IDs are read from environment variables for flexibility
@@ -33,8 +142,8 @@ class ApifyService:
             logger.error("❌ Actor IDs not found in environment variables!")
             raise ValueError("Actor IDs (LINKEDIN_ACTOR_ID, CONTACT_SCRAPER_ACTOR_ID) must be set in the .env file.")
         
-        logger.info(f"   📌 LinkedIn Actor: {self.LINKEDIN_ACTOR_ID}")
-        logger.info(f"   📌 Contact Scraper Actor: {self.CONTACT_SCRAPER_ACTOR_ID}")
+        logger.info("   📌 LinkedIn Actor: %s", self.LINKEDIN_ACTOR_ID)
+        logger.info("   📌 Contact Scraper Actor: %s", self.CONTACT_SCRAPER_ACTOR_ID)
         logger.info("✅ Apify Service initialized successfully")
         logger.info("=" * 80)
 
@@ -42,74 +151,51 @@ class ApifyService:
     def _run_actor(self, actor_id: str, run_input: dict, memory_mbytes: int | None = None, timeout_secs: int | None = None, max_retries: int = 3) -> list:
         """
         A generic method to run any actor and retrieve its results from the dataset.
-        Includes retry logic with exponential backoff for transient errors.
+        Collects _run_actor_streaming, so both share the same retry and fetch logic;
+        returns an empty list if the run fails.
         """
-        logger.info("-" * 80)
-        logger.info(f"🎬 EXECUTING APIFY ACTOR")
-        logger.info(f"   Actor ID: {actor_id}")
-        logger.info(f"   Input Parameters: {run_input}")
-        logger.info(f"   Memory (MB): {memory_mbytes}")
-        logger.info(f"   Timeout (s) : {timeout_secs}")
-        logger.info(f"   Max Retries: {max_retries}")
-        logger.info("-" * 80)
-        
-        for attempt in range(1, max_retries + 1):
+        return list(self._run_actor_streaming(actor_id, run_input, memory_mbytes, timeout_secs, max_retries))
+
+    def _fetch_dataset_page(self, dataset_id: str, offset: int, limit: int) -> tuple:
+        """
+        Fetches one page of dataset items from the Apify REST API, retrying with backoff.
+        Returns the items and the dataset's total item count (None if Apify did not send it);
+        raises once DATASET_PAGE_ATTEMPTS attempts have failed.
+        """
+        for attempt in range(1, DATASET_PAGE_ATTEMPTS + 1):
             try:
-                if attempt > 1:
-                    # Exponential backoff: 5s, 10s, 20s
-                    wait_time = 5 * (2 ** (attempt - 2))
-                    logger.info(f"⏰ Retry attempt {attempt}/{max_retries} - Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
-                
-                logger.info(f"⏳ Starting actor execution (attempt {attempt}/{max_retries})...")
-                actor_run = self.client.actor(actor_id).call(
-                    run_input=run_input,
-                    memory_mbytes=memory_mbytes,
-                    timeout_secs=timeout_secs,
+                response = self._http.get(
+                    f"{APIFY_API_BASE_URL}/datasets/{dataset_id}/items",
+                    params={'offset': offset, 'limit': limit, 'clean': 'true', 'format': 'json'},
+                    timeout=60,
                 )
-                
-                run_id = actor_run.get('id', 'unknown')
-                dataset_id = actor_run.get('defaultDatasetId', 'unknown')
-                run_status = actor_run.get('status', 'unknown')
-                
-                logger.info(f"✅ Actor execution completed")
-                logger.info(f"   Run ID: {run_id}")
-                logger.info(f"   Status: {run_status}")
-                logger.info(f"   Dataset ID: {dataset_id}")
-                
-                logger.info(f"📥 Fetching results from dataset...")
-                items = list(self.client.dataset(dataset_id).iterate_items())
-                
-                logger.info(f"✅ Successfully retrieved {len(items)} item(s)")
-                logger.info("-" * 80)
-                return items
-                
-            except Exception as e:
-                error_msg = str(e)
-                logger.error("-" * 80)
-                logger.error(f"❌ ACTOR EXECUTION FAILED (Attempt {attempt}/{max_retries})")
-                logger.error(f"   Actor ID: {actor_id}")
-                logger.error(f"   Error: {error_msg}")
-                
-                # Check if it's a transient error that we should retry
-                is_retryable = any(keyword in error_msg.lower() for keyword in [
-                    'timeout', 'connection', 'network', 'temporary', 'rate limit', '429', '503', '502'
-                ])
-                
-                if attempt < max_retries and is_retryable:
-                    logger.warning(f"⚠️  Transient error detected. Will retry...")
-                    logger.error("-" * 80)
-                    continue
-                else:
-                    if attempt >= max_retries:
-                        logger.error(f"❌ Maximum retries ({max_retries}) reached. Giving up.")
-                    else:
-                        logger.error(f"❌ Non-retryable error. Not attempting retry.")
-                    logger.error("-" * 80)
-                    return []
-        
-        # If we get here, all retries failed
-        return []
+                response.raise_for_status()
+                total = response.headers.get('X-Apify-Pagination-Total')
+                return orjson.loads(response.content), int(total) if total and total.isdigit() else None
+            except requests.RequestException as e:
+                if attempt == DATASET_PAGE_ATTEMPTS:
+                    raise
+                wait_time = _backoff_seconds(attempt)
+                logger.warning("⚠️  Dataset %s page at offset %s failed (attempt %s/%s): %s. Retrying in %.1f seconds...",
+                               dataset_id, offset, attempt, DATASET_PAGE_ATTEMPTS, e, wait_time)
+                time.sleep(wait_time)
+
+    def _iter_dataset_items(self, dataset_id: str, page_size: int = DATASET_PAGE_SIZE):
+        """
+        Yields dataset items one page at a time, so only a single page is held in memory.
+        The next page is fetched in the background while the current one is being consumed.
+        """
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            offset = 0
+            next_page = prefetcher.submit(self._fetch_dataset_page, dataset_id, offset, page_size)
+            while next_page is not None:
+                page, total = next_page.result()
+                # clean=true drops empty items from a page, so a short page is not necessarily the
+                # last one: offsets always move by the full page and the total decides when to stop
+                offset += page_size
+                has_more = offset < total if total is not None else bool(page)
+                next_page = prefetcher.submit(self._fetch_dataset_page, dataset_id, offset, page_size) if has_more else None
+                yield from page
 
     def _run_actor_streaming(self, actor_id: str, run_input: dict, memory_mbytes: int | None = None, timeout_secs: int | None = None, max_retries: int = 3):
         """
@@ -119,23 +205,24 @@ class ApifyService:
         This is the MEMORY-OPTIMIZED version for large datasets.
         """
         logger.info("-" * 80)
-        logger.info(f"🎬 EXECUTING APIFY ACTOR (STREAMING MODE)")
-        logger.info(f"   Actor ID: {actor_id}")
-        logger.info(f"   Input Parameters: {run_input}")
-        logger.info(f"   Memory (MB): {memory_mbytes}")
-        logger.info(f"   Timeout (s) : {timeout_secs}")
-        logger.info(f"   Max Retries: {max_retries}")
-        logger.info(f"   🔄 Mode: Incremental/Streaming (Memory Optimized)")
+        logger.info("🎬 EXECUTING APIFY ACTOR (STREAMING MODE)")
+        logger.info("   Actor ID: %s", actor_id)
+        logger.info("   Input Parameters: %s", run_input)
+        logger.info("   Memory (MB): %s", memory_mbytes)
+        logger.info("   Timeout (s) : %s", timeout_secs)
+        logger.info("   Max Retries: %s", max_retries)
+        logger.info("   🔄 Mode: Incremental/Streaming (Memory Optimized)")
         logger.info("-" * 80)
         
         for attempt in range(1, max_retries + 1):
+            item_count = 0
             try:
                 if attempt > 1:
-                    wait_time = 5 * (2 ** (attempt - 2))
-                    logger.info(f"⏰ Retry attempt {attempt}/{max_retries} - Waiting {wait_time} seconds before retry...")
+                    wait_time = _backoff_seconds(attempt)
+                    logger.info("⏰ Retry attempt %s/%s - Waiting %.1f seconds before retry...", attempt, max_retries, wait_time)
                     time.sleep(wait_time)
                 
-                logger.info(f"⏳ Starting actor execution (attempt {attempt}/{max_retries})...")
+                logger.info("⏳ Starting actor execution (attempt %s/%s)...", attempt, max_retries)
                 actor_run = self.client.actor(actor_id).call(
                     run_input=run_input,
                     memory_mbytes=memory_mbytes,
@@ -146,72 +233,80 @@ class ApifyService:
                 dataset_id = actor_run.get('defaultDatasetId', 'unknown')
                 run_status = actor_run.get('status', 'unknown')
                 
-                logger.info(f"✅ Actor execution completed")
-                logger.info(f"   Run ID: {run_id}")
-                logger.info(f"   Status: {run_status}")
-                logger.info(f"   Dataset ID: {dataset_id}")
+                logger.info("✅ Actor execution completed")
+                logger.info("   Run ID: %s", run_id)
+                logger.info("   Status: %s", run_status)
+                logger.info("   Dataset ID: %s", dataset_id)
                 
-                logger.info(f"📥 Streaming results from dataset (processing incrementally)...")
+                logger.info("📥 Streaming results from dataset (processing incrementally)...")
                 
                 # Yield items one by one instead of loading all into memory
-                item_count = 0
-                for item in self.client.dataset(dataset_id).iterate_items():
+                for item in self._iter_dataset_items(dataset_id):
                     item_count += 1
-                    if item_count % 10 == 0:
-                        logger.info(f"   📊 Processed {item_count} items so far...")
+                    # Log at 1, 2, 4, 8, ... items so long streams stay quiet
+                    if item_count & (item_count - 1) == 0:
+                        logger.info("   📊 Processed %s items so far...", item_count)
                     yield item
                 
-                logger.info(f"✅ Successfully streamed {item_count} item(s)")
+                logger.info("✅ Successfully streamed %s item(s)", item_count)
                 logger.info("-" * 80)
                 return  # Generator finished successfully
                 
             except Exception as e:
                 error_msg = str(e)
                 logger.error("-" * 80)
-                logger.error(f"❌ ACTOR EXECUTION FAILED (Attempt {attempt}/{max_retries})")
-                logger.error(f"   Actor ID: {actor_id}")
-                logger.error(f"   Error: {error_msg}")
+                logger.error("❌ ACTOR EXECUTION FAILED (Attempt %s/%s)", attempt, max_retries)
+                logger.error("   Actor ID: %s", actor_id)
+                logger.error("   Error: %s", error_msg)
                 
                 is_retryable = any(keyword in error_msg.lower() for keyword in [
                     'timeout', 'connection', 'network', 'temporary', 'rate limit', '429', '503', '502'
                 ])
                 
+                if item_count:
+                    # Items already handed out cannot be taken back, so a rerun would duplicate them.
+                    # Raising (instead of ending the stream) keeps a truncated result from looking complete.
+                    logger.error("❌ Stream interrupted after %s item(s). Not retrying to avoid duplicates.", item_count)
+                    logger.error("-" * 80)
+                    raise
                 if attempt < max_retries and is_retryable:
-                    logger.warning(f"⚠️  Transient error detected. Will retry...")
+                    logger.warning("⚠️  Transient error detected. Will retry...")
                     logger.error("-" * 80)
                     continue
                 else:
                     if attempt >= max_retries:
-                        logger.error(f"❌ Maximum retries ({max_retries}) reached. Giving up.")
+                        logger.error("❌ Maximum retries (%s) reached. Giving up.", max_retries)
                     else:
-                        logger.error(f"❌ Non-retryable error. Not attempting retry.")
+                        logger.error("❌ Non-retryable error. Not attempting retry.")
                     logger.error("-" * 80)
                     return  # Exit generator
         
         # If we get here, all retries failed
         return
 
-    def run_linkedin_job_scraper(self, search_url: str, max_results: int = 30, proxy_group: str = "RESIDENTIAL", memory_mbytes: int = 512, max_concurrency: int = 1) -> list:
+    def run_linkedin_job_scraper(self, search_url: str = None, max_results: int = 30, proxy_group: str = "RESIDENTIAL", memory_mbytes: int = 512, max_concurrency: int = 1, search_urls: list = None) -> list:
         """
         Runs the LinkedIn job scraping actor.
         The 'proxy_group' parameter was added for consistency.
+        Pass 'search_urls' to run several searches in one actor run; 'max_results' applies per search.
         """
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("🔍 LINKEDIN JOB SCRAPER")
-        logger.info("=" * 80)
-        logger.info(f"🔗 Search URL: {search_url}")
-        logger.info(f"📊 Max Results: {max_results}")
-        logger.info(f"🌐 Proxy Type: {proxy_group.upper()}")
-        logger.info(f"🏢 Include Company Details: Yes")
-        logger.info(f"⚙️  Max Concurrency: {max_concurrency}")
-        logger.info(f"💾 Memory Allocated: {memory_mbytes} MB")
-        logger.info("=" * 80)
+        search_urls = search_urls or [search_url]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("")
+            logger.info("=" * 80)
+            logger.info("🔍 LINKEDIN JOB SCRAPER")
+            logger.info("=" * 80)
+            logger.info("🔗 Search URL(s): %s", ", ".join(search_urls))
+            logger.info("📊 Max Results: %s", max_results)
+            logger.info("🌐 Proxy Type: %s", proxy_group.upper())
+            logger.info("🏢 Include Company Details: Yes")
+            logger.info("⚙️  Max Concurrency: %s", max_concurrency)
+            logger.info("💾 Memory Allocated: %s MB", memory_mbytes)
+            logger.info("=" * 80)
         
         run_input = {
-            "search_url": search_url,
+            **_linkedin_search_input(search_urls, max_results),
             "include_company_details": True,
-            "max_results": max_results,
             "proxy_group": proxy_group.upper(),
             # actor-specific concurrency setting (if supported)
             "maxConcurrency": max_concurrency,
@@ -235,8 +330,8 @@ class ApifyService:
         
         if results:
             logger.info("=" * 80)
-            logger.info(f"✅ LINKEDIN SCRAPING COMPLETED")
-            logger.info(f"   Jobs found: {len(results)}")
+            logger.info("✅ LINKEDIN SCRAPING COMPLETED")
+            logger.info("   Jobs found: %s", len(results))
             logger.info("=" * 80)
         else:
             logger.warning("=" * 80)
@@ -256,7 +351,7 @@ class ApifyService:
         
         return results
 
-    def run_linkedin_job_scraper_streaming(self, search_url: str, max_results: int = 30, proxy_group: str = "RESIDENTIAL", memory_mbytes: int = 512, max_concurrency: int = 1):
+    def run_linkedin_job_scraper_streaming(self, search_url: str = None, max_results: int = 30, proxy_group: str = "RESIDENTIAL", memory_mbytes: int = 512, max_concurrency: int = 1, search_urls: list = None):
         """
         MEMORY-OPTIMIZED VERSION: Streams LinkedIn job results incrementally.
         
@@ -269,24 +364,27 @@ class ApifyService:
             for job in apify_service.run_linkedin_job_scraper_streaming(...):
                 # Process this job immediately
                 # Scrape contacts, save to sheet, etc.
+
+        Pass 'search_urls' to run several searches in one actor run; 'max_results' applies per search.
         """
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("🔍 LINKEDIN JOB SCRAPER (STREAMING MODE)")
-        logger.info("=" * 80)
-        logger.info(f"🔗 Search URL: {search_url}")
-        logger.info(f"📊 Max Results: {max_results}")
-        logger.info(f"🌐 Proxy Type: {proxy_group.upper()}")
-        logger.info(f"🏢 Include Company Details: Yes")
-        logger.info(f"⚙️  Max Concurrency: {max_concurrency}")
-        logger.info(f"💾 Memory Allocated: {memory_mbytes} MB")
-        logger.info(f"🔄 Processing Mode: INCREMENTAL (Memory Optimized)")
-        logger.info("=" * 80)
+        search_urls = search_urls or [search_url]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("")
+            logger.info("=" * 80)
+            logger.info("🔍 LINKEDIN JOB SCRAPER (STREAMING MODE)")
+            logger.info("=" * 80)
+            logger.info("🔗 Search URL(s): %s", ", ".join(search_urls))
+            logger.info("📊 Max Results: %s", max_results)
+            logger.info("🌐 Proxy Type: %s", proxy_group.upper())
+            logger.info("🏢 Include Company Details: Yes")
+            logger.info("⚙️  Max Concurrency: %s", max_concurrency)
+            logger.info("💾 Memory Allocated: %s MB", memory_mbytes)
+            logger.info("🔄 Processing Mode: INCREMENTAL (Memory Optimized)")
+            logger.info("=" * 80)
         
         run_input = {
-            "search_url": search_url,
+            **_linkedin_search_input(search_urls, max_results),
             "include_company_details": True,
-            "max_results": max_results,
             "proxy_group": proxy_group.upper(),
             "maxConcurrency": max_concurrency,
             "headless": True,
@@ -310,11 +408,12 @@ class ApifyService:
             yield job
         
         if jobs_yielded > 0:
-            logger.info("=" * 80)
-            logger.info(f"✅ LINKEDIN SCRAPING COMPLETED (STREAMING)")
-            logger.info(f"   Jobs yielded: {jobs_yielded}")
-            logger.info(f"   Memory Usage: Optimized (incremental processing)")
-            logger.info("=" * 80)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("=" * 80)
+                logger.info("✅ LINKEDIN SCRAPING COMPLETED (STREAMING)")
+                logger.info("   Jobs yielded: %s", jobs_yielded)
+                logger.info("   Memory Usage: Optimized (incremental processing)")
+                logger.info("=" * 80)
         else:
             logger.warning("=" * 80)
             logger.warning("⚠️  NO JOBS FOUND OR SCRAPING FAILED")
@@ -331,78 +430,218 @@ class ApifyService:
             logger.warning("   4. Try different proxy_group (GOOGLE_SERP, SHADER)")
             logger.warning("=" * 80)
 
-    def run_contact_detail_scraper(self, website_url: str,
-                                   memory_mbytes: int = 512,
-                                   max_concurrency: int = 1,
-                                   max_depth: int = 2,
-                                   max_requests: int = 5) -> list:
+
+class TokenBucket:
+    """
+    Async token bucket allowing `rate` requests per second, with bursts of up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until a token is available and takes it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _start_request_retryable(error: Exception) -> bool:
+    """
+    Whether a failed 'start run' request is known not to have started a run, so it can be re-sent.
+    Only connection failures and 429/5xx answers qualify: after a read timeout the run may already exist.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """
+    Reads how long the server asked us to wait from Retry-After or X-RateLimit-Reset, if present.
+    """
+    retry_after = response.headers.get('retry-after')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                return None
+
+    reset = response.headers.get('x-ratelimit-reset')
+    if reset:
+        try:
+            reset = float(reset)
+        except ValueError:
+            return None
+        # Either an epoch timestamp or a number of seconds
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+    return None
+
+
+class ApifyAsyncService:
+    """
+    Async counterpart of ApifyService that talks to the Apify REST API directly.
+    One HTTP/2 client is kept open for the lifetime of the service, so concurrent actor
+    runs multiplex their polling over shared keep-alive connections.
+    Use it as `async with ApifyAsyncService(token) as service:` inside one event loop.
+    """
+
+    def __init__(self, api_token: str):
+        if not api_token:
+            logger.error("❌ Apify API token is missing!")
+            raise ValueError("Apify API token is required.")
+
+        self.CONTACT_SCRAPER_ACTOR_ID = os.environ.get("CONTACT_SCRAPER_ACTOR_ID")
+        if not self.CONTACT_SCRAPER_ACTOR_ID:
+            logger.error("❌ Actor IDs not found in environment variables!")
+            raise ValueError("Actor ID CONTACT_SCRAPER_ACTOR_ID must be set in the .env file.")
+
+        self._client = httpx.AsyncClient(
+            http2=True,
+            base_url=APIFY_API_BASE_URL,
+            headers={"Authorization": f"Bearer {api_token}"},
+            limits=httpx.Limits(max_keepalive_connections=32),
+            # Run polling long-polls for up to 60s, so reads need a longer timeout
+            timeout=httpx.Timeout(10, read=90),
+        )
+        # Shared by every concurrent actor run of this service
+        self._bucket = TokenBucket(APIFY_REQUESTS_PER_SECOND)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the pooled HTTP connections."""
+        await self._client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends one rate-limited API request and raises for error statuses.
+        Slows down on its own when the API reports less than 10% of its rate limit left.
+        """
+        await self._bucket.acquire()
+        response = await self._client.request(method, url, **kwargs)
+
+        remaining = response.headers.get('x-ratelimit-remaining')
+        limit = response.headers.get('x-ratelimit-limit')
+        if remaining and limit and remaining.isdigit() and limit.isdigit() and int(remaining) < int(limit) * 0.1:
+            logger.warning("⚠️  Apify rate limit nearly exhausted (%s/%s left). Throttling...", remaining, limit)
+            await asyncio.sleep(_retry_after_seconds(response) or 1)
+
+        response.raise_for_status()
+        return response
+
+    async def _iter_dataset_items(self, dataset_id: str):
+        """
+        Streams a dataset as JSON lines, yielding each item as soon as it is received.
+        """
+        await self._bucket.acquire()
+        async with self._client.stream("GET", f"/datasets/{dataset_id}/items", params={'format': 'jsonl', 'clean': 'true'}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield orjson.loads(line)
+
+    async def _run_actor(self, actor_id: str, run_input: dict, memory_mbytes: int | None = None, timeout_secs: int | None = None, max_retries: int = 3) -> list:
+        """
+        Starts an actor run, waits for it without blocking the event loop and returns its dataset items.
+        Includes the same retry logic with exponential backoff as ApifyService._run_actor, except
+        that a run is started at most once per call unless the start request surely failed:
+        later retries keep polling the run that was already started.
+        """
+        logger.info("🎬 EXECUTING APIFY ACTOR (ASYNC) - Actor ID: %s", actor_id)
+        params = {key: value for key, value in {'memory': memory_mbytes, 'timeout': timeout_secs}.items() if value is not None}
+
+        retry_after = None
+        actor_run = None
+        for attempt in range(1, max_retries + 1):
+            try:
+                if attempt > 1:
+                    # Honour the server's requested delay after a 429, otherwise back off with jitter
+                    wait_time = retry_after if retry_after is not None else _backoff_seconds(attempt)
+                    logger.info("⏰ Retry attempt %s/%s - Waiting %.1f seconds before retry...", attempt, max_retries, wait_time)
+                    await asyncio.sleep(wait_time)
+
+                if actor_run is None:
+                    response = await self._request(
+                        "POST",
+                        f"/acts/{actor_id.replace('/', '~')}/runs",
+                        params=params,
+                        content=orjson.dumps(run_input),
+                        headers={"Content-Type": "application/json"},
+                    )
+                    actor_run = orjson.loads(response.content)['data']
+
+                # waitForFinish makes the API hold each poll open until the run ends (max 60s)
+                while actor_run['status'] not in ACTOR_RUN_TERMINAL_STATUSES:
+                    response = await self._request("GET", f"/actor-runs/{actor_run['id']}", params={'waitForFinish': 60})
+                    actor_run = orjson.loads(response.content)['data']
+
+                logger.info("✅ Actor run %s finished with status %s", actor_run['id'], actor_run['status'])
+
+                items = [item async for item in self._iter_dataset_items(actor_run['defaultDatasetId'])]
+
+                logger.info("✅ Successfully retrieved %s item(s)", len(items))
+                return items
+
+            except Exception as e:
+                error_msg = str(e)
+                logger.error("❌ ACTOR EXECUTION FAILED (Attempt %s/%s) - Actor ID: %s - Error: %s", attempt, max_retries, actor_id, error_msg)
+
+                rate_limited = isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429
+                retry_after = _retry_after_seconds(e.response) if rate_limited else None
+
+                if actor_run is None:
+                    # A lost response may still have started a (paid) run, so only re-send a start that surely failed
+                    is_retryable = _start_request_retryable(e)
+                else:
+                    is_retryable = rate_limited or isinstance(e, httpx.TransportError) or any(keyword in error_msg.lower() for keyword in [
+                        'timeout', 'connection', 'network', 'temporary', 'rate limit', '429', '503', '502'
+                    ])
+
+                if attempt < max_retries and is_retryable:
+                    logger.warning("⚠️  Transient error detected. Will retry...")
+                    continue
+                if attempt >= max_retries:
+                    logger.error("❌ Maximum retries (%s) reached. Giving up.", max_retries)
+                else:
+                    logger.error("❌ Non-retryable error. Not attempting retry.")
+                return []
+
+        return []
+
+    async def run_contact_detail_scraper(self, website_url: str,
+                                         memory_mbytes: int = 512,
+                                         max_concurrency: int = 1,
+                                         max_depth: int = 2,
+                                         max_requests: int = 5) -> list:
         """
         Runs the actor to scrape contact details from a website (Module 2).
+        Awaitable, so many websites can be scraped concurrently.
         """
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("📧 CONTACT DETAIL SCRAPER")
-        logger.info("=" * 80)
-        logger.info(f"🌐 Target Website: {website_url}")
-        logger.info(f"🔍 Max Depth: {max_depth} levels")
-        logger.info(f"📄 Max Requests: {max_requests} pages")
-        logger.info(f"🔒 Same Domain Only: Yes")
-        logger.info(f"🖼️  Include Frames: Yes")
-        logger.info(f"⚙️  Max Concurrency: {max_concurrency}")
-        logger.info(f"💾 Memory Allocated: {memory_mbytes} MB")
-        logger.info("=" * 80)
-        
-        run_input = {
-            "startUrls": [{"url": website_url, "method": "GET"}],
-            "maxDepth": max_depth,
-            "maxRequests": max_requests,
-            "sameDomain": True,
-            "considerChildFrames": True,
-            # concurrency to reduce RAM (if actor supports it)
-            "maxConcurrency": max_concurrency,
-            # reduce extras
-            "saveScreenshots": False,
-            "debugMode": False,
-            # Additional stability settings
-            "ignoreSslErrors": True,  # Handle SSL certificate issues
-            "maxRequestRetries": 3,  # Retry failed requests within the actor
-        }
-        
-        logger.info("🚀 Initiating contact detail scraping...")
-        results = self._run_actor(
+        run_input = _contact_scraper_input(website_url, memory_mbytes, max_concurrency, max_depth, max_requests)
+
+        logger.info("🚀 Initiating contact detail scraping (async)...")
+        results = await self._run_actor(
             self.CONTACT_SCRAPER_ACTOR_ID,
             run_input,
             memory_mbytes=memory_mbytes,
             timeout_secs=600,
         )
-        
-        if results:
-            logger.info("=" * 80)
-            logger.info(f"✅ CONTACT SCRAPING COMPLETED")
-            logger.info(f"   Data records found: {len(results)}")
-            
-            # Show summary of what was found
-            if len(results) > 0:
-                first_result = results[0]
-                emails = first_result.get('emails', [])
-                phones = first_result.get('phones', [])
-                socials = []
-                for key in ['linkedIns', 'twitters', 'facebooks', 'instagrams']:
-                    if first_result.get(key):
-                        socials.append(key)
-                
-                logger.info(f"   📧 Emails found: {len(emails)}")
-                logger.info(f"   📱 Phones found: {len(phones)}")
-                logger.info(f"   🔗 Social media: {len(socials)} types")
-            logger.info("=" * 80)
-        else:
-            logger.warning("=" * 80)
-            logger.warning("⚠️  NO CONTACT DETAILS FOUND")
-            logger.warning(f"   Website: {website_url}")
-            logger.warning("   Possible reasons:")
-            logger.warning("   - Website doesn't have contact information")
-            logger.warning("   - Contact info is behind forms/login")
-            logger.warning("   - Website is blocking scrapers")
-            logger.warning("=" * 80)
-        
+        _log_contact_results(website_url, results)
         return results
@@ -1,8 +1,41 @@
+import functools
 import gspread
 import logging
+import threading
+from typing import NamedTuple
+from gspread.utils import rowcol_to_a1
 
 logger = logging.getLogger(__name__)
 
+# Authenticated clients and opened spreadsheets by (service account path, spreadsheet id).
+# Authenticating and opening cost several round-trips, so every service instance shares them;
+# google-auth refreshes the access token on its own when it expires.
+_connections: dict[tuple[str, str], tuple[gspread.Client, gspread.Spreadsheet]] = {}
+_connections_lock = threading.Lock()
+
+def _get_connection(service_account_path: str, spreadsheet_id: str) -> tuple[gspread.Client, gspread.Spreadsheet]:
+    """
+    Returns the shared client and spreadsheet for these credentials, connecting on first use.
+    """
+    key = (service_account_path, spreadsheet_id)
+    with _connections_lock:
+        connection = _connections.get(key)
+        if connection is None:
+            gc = gspread.service_account(filename=service_account_path)
+            connection = (gc, gc.open_by_key(spreadsheet_id))
+            _connections[key] = connection
+        return connection
+
+@functools.lru_cache(maxsize=None)
+def column_letter(column_index: int) -> str:
+    """Returns the A1 letter(s) of a 1-indexed column, e.g. 28 -> 'AB'."""
+    return rowcol_to_a1(1, column_index)[:-1]
+
+class WorksheetSchema(NamedTuple):
+    """The header row of a worksheet, resolved once: header name -> 1-indexed column and A1 letter."""
+    columns: dict
+    letters: dict
+
 class GoogleSheetsService:
     """
     A wrapper for gspread to simplify interactions with Google Sheets.
@@ -10,41 +43,54 @@ class GoogleSheetsService:
     """
     def __init__(self, service_account_path: str, spreadsheet_id: str):
         try:
-            self.gc = gspread.service_account(filename=service_account_path)
-            self.spreadsheet = self.gc.open_by_key(spreadsheet_id)
+            self.gc, self.spreadsheet = _get_connection(service_account_path, spreadsheet_id)
+            # Worksheet handles by name; each lookup is a metadata round-trip, so fetch once
+            self._ws_cache: dict[str, gspread.Worksheet] = {}
+            # Schemas by worksheet id, so each header row is read from the API only once
+            self._schema_cache: dict[int, WorksheetSchema] = {}
             logger.info("Successfully connected to Google Sheets.")
         except Exception as e:
             logger.error(f"Failed to authenticate or open the Google Sheet: {e}")
             raise
 
     def get_worksheet(self, sheet_name: str) -> gspread.Worksheet:
+        """
+        Returns the worksheet with the given name, fetching it only on first use.
+        """
+        worksheet = self._ws_cache.get(sheet_name)
+        if worksheet is not None:
+            return worksheet
         try:
-            return self.spreadsheet.worksheet(sheet_name)
+            worksheet = self.spreadsheet.worksheet(sheet_name)
         except gspread.exceptions.WorksheetNotFound:
             logger.error(f"Worksheet with name '{sheet_name}' was not found.")
             raise
+        self._ws_cache[sheet_name] = worksheet
+        return worksheet
 
-    def get_column_values(self, worksheet: gspread.Worksheet, column_index: int) -> set:
-        try:
-            values = worksheet.col_values(column_index)
-            # The first value is the header; we remove it.
-            return set(values[1:]) if values else set()
-        except Exception as e:
-            logger.error(f"Error retrieving column values: {e}")
-            raise
-
-    def get_header_map(self, worksheet: gspread.Worksheet) -> dict:
+    def get_schema(self, worksheet: gspread.Worksheet) -> WorksheetSchema:
         """
-        Reads the first row (headers) and returns a dictionary mapping
-        header names to their column numbers (1-indexed).
+        Reads the first row (headers) once and returns the worksheet's cached schema.
         """
+        schema = self._schema_cache.get(worksheet.id)
+        if schema is not None:
+            return schema
         try:
             headers = worksheet.row_values(1)
             logger.info(f"Headers read from Google Sheet: {headers}")
-            return {header.strip(): i + 1 for i, header in enumerate(headers)}
         except Exception as e:
             logger.error(f"Error reading sheet headers: {e}")
-            return {}
+            return WorksheetSchema({}, {})
+        columns = {header.strip(): i for i, header in enumerate(headers, 1)}
+        schema = WorksheetSchema(columns, {header: column_letter(i) for header, i in columns.items()})
+        self._schema_cache[worksheet.id] = schema
+        return schema
+
+    def get_header_map(self, worksheet: gspread.Worksheet) -> dict:
+        """
+        Returns a dictionary mapping header names to their column numbers (1-indexed).
+        """
+        return self.get_schema(worksheet).columns
 
     def get_all_values(self, worksheet: gspread.Worksheet) -> list:
         """
@@ -56,6 +102,21 @@ class GoogleSheetsService:
             logger.error(f"Error retrieving all values from sheet: {e}")
             return []
 
+    def get_columns(self, worksheet: gspread.Worksheet, column_indices: list) -> list:
+        """
+        Fetches only the given columns (1-indexed, without the header) in one values.batchGet request.
+        Returns one list of cell values per column, all padded to the same length.
+        """
+        letters = [column_letter(column_index) for column_index in column_indices]
+        try:
+            value_ranges = worksheet.batch_get([f"{letter}2:{letter}" for letter in letters], major_dimension='COLUMNS')
+        except Exception as e:
+            logger.error(f"Error retrieving columns {', '.join(letters)}: {e}")
+            raise
+        columns = [list(value_range[0]) if value_range else [] for value_range in value_ranges]
+        length = max(map(len, columns), default=0)
+        return [column + [''] * (length - len(column)) for column in columns]
+
     def update_cell(self, worksheet: gspread.Worksheet, row: int, col: int, value: str):
         """
         Updates a single cell in the worksheet.
@@ -68,6 +129,38 @@ class GoogleSheetsService:
             logger.error(f"Error updating cell at (Row {row}, Col {col}): {e}")
             # Do not re-raise, as a single update failure shouldn't stop a whole campaign.
 
+    def batch_update_cells(self, worksheet: gspread.Worksheet, updates: list) -> bool:
+        """
+        Writes many cells in a single values.batchUpdate request and reports whether it succeeded.
+        `updates` is a list of (row, col, value) tuples; row and col are 1-indexed.
+        """
+        if not updates:
+            return True
+        data = [
+            {"range": f"'{worksheet.title}'!{column_letter(col)}{row}", "values": [[value]]}
+            for row, col, value in updates
+        ]
+        try:
+            worksheet.spreadsheet.values_batch_update({"valueInputOption": "USER_ENTERED", "data": data})
+            logger.debug(f"Batch-updated {len(updates)} cell(s)")
+            return True
+        except Exception as e:
+            logger.error(f"Error batch-updating {len(updates)} cell(s): {e}")
+            # Do not re-raise, as a failed status write shouldn't stop a whole campaign.
+            return False
+
+    def batch_append_rows(self, worksheet: gspread.Worksheet, rows: list, value_input_option: str = "USER_ENTERED", insert_data_option: str = None):
+        """
+        Appends many rows in a single request.
+        """
+        if not rows:
+            return
+        try:
+            worksheet.append_rows(rows, value_input_option=value_input_option, insert_data_option=insert_data_option)
+        except Exception as e:
+            logger.error(f"Error appending {len(rows)} row(s) to sheet: {e}")
+            raise
+
     def append_row(self, worksheet: gspread.Worksheet, row_data: list):
         try:
             worksheet.append_row(row_data)
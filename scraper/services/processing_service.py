@@ -1,6 +1,19 @@
 import re
-from typing import List, Dict, Any, Set
-from urllib.parse import urlencode
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable, Optional
+from urllib.parse import quote_plus, urlparse, urlsplit, urlunsplit
+
+from django.core.cache import cache
+
+try:
+    # Optional: only used to index very large link columns compactly (pip install pybloom-live)
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+_NON_DIGIT_RE = re.compile(r'\D')
 
 #=====================================================#
 #  LinkedIn URL Builder
@@ -11,52 +24,138 @@ def build_linkedin_url(keyword: str, location_name: str) -> str:
     Constructs a valid LinkedIn job search URL with the primary parameters.
     This function is simplified to be compatible with the new actor that accepts a full URL.
     """
-    base_url = "https://www.linkedin.com/jobs/search/"
-    params = {
-        "keywords": keyword,
-        "location": location_name,
-    }
     # Other filters like post date or job type should be applied by the user
     # in the frontend or directly in the URL, as per the new actor's documentation.
-    query_string = urlencode(params)
-    return f"{base_url}?{query_string}&f_WT=2&f_TPR=r86400"
+    return (f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(keyword)}"
+            f"&location={quote_plus(location_name)}&f_WT=2&f_TPR=r86400")
+
+def normalize_job_link(url: str) -> str:
+    """
+    Returns a job link in the form used for duplicate checks: trimmed, lowercase scheme
+    and host, no fragment and no trailing slash. Empty input gives an empty string.
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''))
+
+class JobLinkIndex:
+    """
+    Set-like record of job links already in the sheet or claimed during this run.
+    Sheet links are stored in a set, or, past `bloom_threshold` links and with pybloom-live
+    installed, in a bloom filter (a tiny false-positive rate may skip a new job). Links
+    claimed during the run live in a plain set, so they can still be released.
+    """
+    def __init__(self, sheet_links: Iterable[str], bloom_threshold: int = 100_000):
+        sheet_links = [link for link in map(normalize_job_link, sheet_links) if link]
+        if ScalableBloomFilter is not None and len(sheet_links) > bloom_threshold:
+            self._sheet_links = ScalableBloomFilter(initial_capacity=len(sheet_links), error_rate=1e-6)
+            for link in sheet_links:
+                self._sheet_links.add(link)
+        else:
+            self._sheet_links = set(sheet_links)
+        self._claimed = set()
+
+    def __contains__(self, link: str) -> bool:
+        return link in self._claimed or link in self._sheet_links
+
+    def add(self, link: str):
+        self._claimed.add(link)
+
+    def discard(self, link: str):
+        self._claimed.discard(link)
+
+    def difference_update(self, links: Iterable[str]):
+        self._claimed.difference_update(links)
+
+
+#=====================================================#
+#   Contact Details Cache
+#=====================================================#
+
+# Many jobs come from the same employer, so contact details are cached per domain:
+# in-process for the current run, and in Django's cache so reruns within a day skip the scrape.
+# The in-process copy is an LRU of at most CONTACT_CACHE_MAX_ENTRIES domains whose entries
+# expire with the same TTL, so a long-lived worker neither grows without bound nor serves stale details.
+CONTACT_CACHE_TTL = 60 * 60 * 24
+CONTACT_CACHE_MAX_ENTRIES = 1024
+# domain -> (monotonic expiry, contact details), least recently used first
+_contact_cache: OrderedDict[str, tuple] = OrderedDict()
+_contact_cache_lock = threading.Lock()
+
+def _remember_contact_info(domain: str, contact_info: Dict[str, Any]):
+    """Stores contact details in the in-process LRU, evicting the least recently used domain when full."""
+    with _contact_cache_lock:
+        _contact_cache[domain] = (time.monotonic() + CONTACT_CACHE_TTL, contact_info)
+        _contact_cache.move_to_end(domain)
+        while len(_contact_cache) > CONTACT_CACHE_MAX_ENTRIES:
+            _contact_cache.popitem(last=False)
+
+def normalize_domain(url: str) -> str:
+    """Returns the lowercase host of a URL without a leading 'www.' (scheme is optional)."""
+    netloc = urlparse(url if '//' in url else f"//{url}").netloc
+    return netloc.lower().removeprefix("www.")
+
+def get_cached_contact_info(website_url: str) -> Optional[Dict[str, Any]]:
+    """Returns previously scraped contact details for the website's domain, or None on a miss."""
+    domain = normalize_domain(website_url)
+    with _contact_cache_lock:
+        entry = _contact_cache.get(domain)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _contact_cache.move_to_end(domain)
+                return entry[1]
+            del _contact_cache[domain]
+    contact_info = cache.get(f"contact_info:{domain}")
+    if contact_info is not None:
+        _remember_contact_info(domain, contact_info)
+    return contact_info
+
+def cache_contact_info(website_url: str, contact_info: Dict[str, Any]):
+    """Stores processed contact details for the website's domain."""
+    domain = normalize_domain(website_url)
+    _remember_contact_info(domain, contact_info)
+    cache.set(f"contact_info:{domain}", contact_info, CONTACT_CACHE_TTL)
 
 
 #=====================================================#
 #   Data Processing and Cleaning
 #=====================================================#
 
-def _clean_and_get_unique_items(items: List[str]) -> List[str]:
-    """Filters a list of strings and returns only the unique, non-empty items."""
-    if not items:
-        return []
-    return list(set(filter(None, items)))
-
-def _clean_phones(phones: List[str]) -> List[str]:
-    """Takes a list of phone numbers, removes non-numeric characters, and deduplicates them."""
-    if not phones:
-        return []
-    
-    phone_set: Set[str] = set()
-    for phone in phones:
-        if phone and isinstance(phone, str):
-            # Remove any character that is not a digit
-            cleaned_phone = re.sub(r'\D', '', phone)
-            if cleaned_phone:
-                phone_set.add(cleaned_phone)
-    return list(phone_set)
-
-def _clean_emails(emails: List[str]) -> List[str]:
-    """Takes a list of emails, trims whitespace, converts to lowercase, and deduplicates them."""
-    if not emails:
-        return []
-        
-    email_set: Set[str] = set()
-    for email in emails:
-        if email and isinstance(email, str):
-            email_set.add(email.strip().lower())
-    return list(email_set)
+def _first_links(scraped_items: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Returns the first non-empty link for every social platform in one pass over the items,
+    stopping as soon as each platform has a link.
+    """
+    links = dict.fromkeys(_SOCIAL_LINK_KEYS, '')
+    missing = dict(_SOCIAL_LINK_KEYS)
+    for item in scraped_items:
+        for field, key in list(missing.items()):
+            link = next(filter(None, item.get(key) or ()), None)
+            if link:
+                links[field] = link
+                del missing[field]
+        if not missing:
+            break
+    return links
+
+def _clean_phones(phones: Iterable[str]) -> List[str]:
+    """Takes phone numbers, removes non-numeric characters, and deduplicates them."""
+    return list({_NON_DIGIT_RE.sub('', phone) for phone in phones or () if isinstance(phone, str) and phone} - {''})
 
+def _clean_emails(emails: Iterable[str]) -> List[str]:
+    """Takes emails, trims whitespace, converts to lowercase, and deduplicates them."""
+    return list({email.strip().lower() for email in emails or () if isinstance(email, str) and email})
+
+
+# Item fields that hold phone numbers
+_PHONE_KEYS = ('phones', 'phonesUncertain')
+# Output field -> item field for the social links, of which only the first is kept
+_SOCIAL_LINK_KEYS = {
+    'linkedin': 'linkedIns', 'twitter': 'twitters', 'instagram': 'instagrams', 'facebook': 'facebooks',
+    'youtube': 'youtubes', 'tiktok': 'tiktoks', 'pinterest': 'pinterests', 'discord': 'discords',
+}
 
 def process_contact_data(scraped_items: List[Dict[str, Any]], original_job_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -65,53 +164,15 @@ def process_contact_data(scraped_items: List[Dict[str, Any]], original_job_data:
     if not scraped_items:
         return {}
 
-    # Initialize lists to aggregate all data
-    all_emails: List[str] = []
-    all_phones: List[str] = []
-    all_linkedins: List[str] = []
-    all_twitters: List[str] = []
-    all_instagrams: List[str] = []
-    all_facebooks: List[str] = []
-    all_youtubes: List[str] = []
-    all_tiktoks: List[str] = []
-    all_pinterests: List[str] = []
-    all_discords: List[str] = []
-    
-    # Iterate through all scraped items and collect the data
-    for item in scraped_items:
-        all_emails.extend(item.get('emails', []))
-        all_phones.extend(item.get('phones', []))
-        all_phones.extend(item.get('phonesUncertain', []))
-        all_linkedins.extend(item.get('linkedIns', []))
-        all_twitters.extend(item.get('twitters', []))
-        all_instagrams.extend(item.get('instagrams', []))
-        all_facebooks.extend(item.get('facebooks', []))
-        all_youtubes.extend(item.get('youtubes', []))
-        all_tiktoks.extend(item.get('tiktoks', []))
-        all_pinterests.extend(item.get('pinterests', []))
-        all_discords.extend(item.get('discords', []))
-        
-    # Clean and deduplicate the collected data
-    unique_phones = _clean_phones(all_phones)
-    unique_emails = _clean_emails(all_emails)
-    
-    def get_first_unique_link(links: list) -> str:
-        """Helper function to get the first valid link from a list."""
-        unique_links = _clean_and_get_unique_items(links)
-        return unique_links[0] if unique_links else ''
+    # Clean and deduplicate straight from the items, without intermediate lists
+    unique_phones = _clean_phones(phone for item in scraped_items for key in _PHONE_KEYS for phone in item.get(key) or ())
+    unique_emails = _clean_emails(email for item in scraped_items for email in item.get('emails') or ())
 
     # Compile the final, clean dictionary
     clean_data = {
         "domain": scraped_items[0].get('domain', ''),
         "phones": ', '.join(unique_phones),
         "emails": ', '.join(unique_emails),
-        "linkedin": get_first_unique_link(all_linkedins),
-        "twitter": get_first_unique_link(all_twitters),
-        "instagram": get_first_unique_link(all_instagrams),
-        "facebook": get_first_unique_link(all_facebooks),
-        "youtube": get_first_unique_link(all_youtubes),
-        "tiktok": get_first_unique_link(all_tiktoks),
-        "pinterest": get_first_unique_link(all_pinterests),
-        "discord": get_first_unique_link(all_discords),
+        **_first_links(scraped_items),
     }
     return clean_data
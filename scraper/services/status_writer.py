@@ -0,0 +1,140 @@
+import atexit
+import time
+import logging
+import sqlite3
+import threading
+import gspread
+from .google_sheets_service import GoogleSheetsService
+
+logger = logging.getLogger(__name__)
+
+class StatusJournal:
+    """
+    A local SQLite (WAL mode) record of status cells that are not yet in Google Sheets.
+    Cells are recorded when queued and removed once written, so a crashed campaign's
+    unwritten statuses survive on disk and are replayed by the next writer of that scope.
+    Each cell also keeps a `row_key` (the row's contact cell when it was queued), so a
+    replay can tell whether the row still holds the same target.
+    """
+    def __init__(self, path: str, scope: str):
+        self.scope = scope
+        self._lock = threading.Lock()
+        # atexit runs on the main thread, so the connection is shared across threads under the lock
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_status ("
+            "scope TEXT NOT NULL, row INTEGER NOT NULL, col INTEGER NOT NULL, value TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, PRIMARY KEY (scope, row, col))"
+        )
+        # Journals created before row keys existed get an empty key, which never matches a target
+        columns = {info[1] for info in self._conn.execute("PRAGMA table_info(pending_status)")}
+        if 'row_key' not in columns:
+            self._conn.execute("ALTER TABLE pending_status ADD COLUMN row_key TEXT NOT NULL DEFAULT ''")
+        self._conn.commit()
+
+    def record(self, row: int, col: int, value: str, row_key: str = ''):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pending_status (scope, row, col, value, updated_at, row_key) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (scope, row, col) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at, row_key = excluded.row_key",
+                (self.scope, row, col, value, time.time(), row_key),
+            )
+            self._conn.commit()
+
+    def pending(self) -> list:
+        """Returns the (row, col, value, row_key) cells of this scope that were never written."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT row, col, value, row_key FROM pending_status WHERE scope = ? ORDER BY row, col", (self.scope,)
+            ).fetchall()
+
+    def discard(self, updates: list):
+        """Forgets cells that reached the sheet, unless they were re-queued with a newer value."""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM pending_status WHERE scope = ? AND row = ? AND col = ? AND value = ?",
+                [(self.scope, row, col, value) for row, col, value in updates],
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class StatusWriter:
+    """
+    Buffers single-cell status writes and sends them to Google Sheets in batches.
+    A batch is flushed once `flush_size` cells are queued or `flush_interval` seconds
+    have passed since the last flush; call close() when the campaign ends.
+    With a `journal`, queued cells are also kept on disk until they are written, and
+    cells a previous run left behind are sent with the first batch. `row_key(row)` returns
+    the row's current contact cell; a recovered cell is only replayed if its row still
+    holds the contact it was queued for (rows may have been sorted or deleted since).
+    """
+    def __init__(self, sheets_service: GoogleSheetsService, worksheet: gspread.Worksheet, flush_size: int = 20, flush_interval: float = 5, journal: StatusJournal = None, row_key=None):
+        self.sheets_service = sheets_service
+        self.worksheet = worksheet
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.journal = journal
+        self._row_key = row_key or (lambda row: '')
+        self._pending = self._recover() if journal else []
+        self._last_flush = time.monotonic()
+        # Last-chance write if the process exits while a campaign is still running
+        atexit.register(self.flush)
+
+    def _recover(self) -> list:
+        """
+        Returns the journaled cells whose rows still hold the same contact and forgets the rest.
+        """
+        recovered, stale = [], []
+        for row, col, value, row_key in self.journal.pending():
+            (recovered if row_key and row_key == self._row_key(row) else stale).append((row, col, value))
+        if stale:
+            logger.warning(f"🗑️  Dropped {len(stale)} journaled status cell(s) whose rows no longer match")
+            self.journal.discard(stale)
+        if recovered:
+            logger.warning(f"♻️  Recovered {len(recovered)} unwritten status cell(s) from a previous run")
+        return recovered
+
+    def queued_rows(self, col: int) -> set:
+        """
+        Returns the rows that have a queued, not yet written value in the given column.
+        """
+        return {row for row, queued_col, _ in self._pending if queued_col == col}
+
+    def queue(self, row: int, col: int, value: str):
+        """
+        Queues a write to one cell (1-indexed), flushing if the batch is full or due.
+        """
+        if self.journal:
+            self.journal.record(row, col, value, self._row_key(row))
+        self._pending.append((row, col, value))
+        if len(self._pending) >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes every queued cell in one values.batchUpdate request.
+        Cells that fail to write stay queued (and journaled) for the next flush.
+        """
+        if self._pending:
+            batch, self._pending = self._pending, []
+            if self.sheets_service.batch_update_cells(self.worksheet, batch):
+                logger.info(f"💾 Wrote {len(batch)} status cell(s) to Google Sheets")
+                if self.journal:
+                    self.journal.discard(batch)
+            else:
+                self._pending = batch + self._pending
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """
+        Flushes the remaining cells and releases the journal.
+        """
+        atexit.unregister(self.flush)
+        self.flush()
+        if self.journal:
+            self.journal.close()
@@ -1,29 +1,124 @@
+import asyncio
+import itertools
 import logging
 import threading
 import os
-import uuid
+import sys
 import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from types import MappingProxyType
 
 from dotenv import load_dotenv
 from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import render
 from django.views import View
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-from .services.apify_service import ApifyService
+from .services.apify_service import ApifyAsyncService, ApifyService
 from .services.google_sheets_service import GoogleSheetsService
-from .services.processing_service import build_linkedin_url, process_contact_data
-from messenger.services import send_email, send_whatsapp_message, upload_file_to_inboxino
+from .services.status_writer import StatusJournal, StatusWriter
+from .services.processing_service import (
+    JobLinkIndex, build_linkedin_url, cache_contact_info, get_cached_contact_info, normalize_domain, normalize_job_link,
+    process_contact_data,
+)
+from messenger.services import SendResult, load_resume, make_whatsapp_sender, send_email, upload_file_to_inboxino
 from messenger.rate_limiter_service import RateLimiterService
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-tasks_status = {}
-tasks_lock = threading.Lock()
+# Task state lives in Django's cache (Redis in production) so any worker can serve status polls.
+# Each task is only written by the thread running it, so a plain get/set update is safe.
+TASK_STATUS_TIMEOUT = 60 * 60 * 24
+
+def _task_key(task_id: str, field: str = 'status') -> str:
+    return f"task:{task_id}:{field}"
+
+def _create_task_status(task_id: str, task_info: dict):
+    """Stores the initial state of a new task and resets its processed counter."""
+    cache.set_many({_task_key(task_id): task_info, _task_key(task_id, 'processed'): 0}, TASK_STATUS_TIMEOUT)
+
+def _update_task_status(task_id: str, **fields):
+    """Merges the given fields into a task's stored state."""
+    task_info = cache.get(_task_key(task_id)) or {}
+    task_info.update(fields)
+    cache.set(_task_key(task_id), task_info, TASK_STATUS_TIMEOUT)
+
+def _increment_task_processed(task_id: str):
+    """Atomically bumps a task's processed-items counter."""
+    try:
+        cache.incr(_task_key(task_id, 'processed'))
+    except ValueError:
+        cache.set(_task_key(task_id, 'processed'), 1, TASK_STATUS_TIMEOUT)
+
+# Background tasks share one bounded pool; beyond MAX_PENDING_TASKS (running + queued) new starts get a 503
+MAX_CONCURRENT_TASKS = 4
+MAX_PENDING_TASKS = 8
+
+def _make_task_executor():
+    """
+    Builds the background task pool. When gevent has patched threading, a plain executor would
+    run every task as a greenlet on the request hub, so gevent's pool of native threads is used.
+    """
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor(max_workers=MAX_CONCURRENT_TASKS)
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TASKS, thread_name_prefix='campaign')
+
+_task_executor = _make_task_executor()
+_task_futures: dict[str, Future] = {}
+_task_futures_lock = threading.Lock()
+
+def _submit_task(task_id: str, task_info: dict, target, *args) -> bool:
+    """
+    Records a new task and queues it on the shared pool. Returns False if the pool is saturated.
+    """
+    with _task_futures_lock:
+        if len(_task_futures) >= MAX_PENDING_TASKS:
+            return False
+        _create_task_status(task_id, task_info)
+        future = _task_executor.submit(_run_task, target, task_id, *args)
+        _task_futures[task_id] = future
+    future.add_done_callback(lambda f: _on_task_done(task_id, f))
+    return True
+
+def _run_task(target, task_id: str, *args):
+    """Marks a queued task as running once a pool thread picks it up, then runs it."""
+    _update_task_status(task_id, status='running')
+    target(task_id, *args)
+
+def _on_task_done(task_id: str, future: Future):
+    """Forgets a finished task's future, marking the task failed if it raised."""
+    with _task_futures_lock:
+        _task_futures.pop(task_id, None)
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f"Task [{task_id}]: crashed: {exc}")
+        _update_task_status(task_id, status='failed', error=str(exc), finished_at=datetime.utcnow())
+
+_apify_service = None
+_apify_service_lock = threading.Lock()
+
+def get_sheets_service() -> GoogleSheetsService:
+    """
+    Returns a Sheets service for the configured spreadsheet. Instances share one authenticated
+    connection, while each task still gets its own header and column caches.
+    """
+    return GoogleSheetsService(os.environ["GOOGLE_SERVICE_ACCOUNT_PATH"], os.environ["GOOGLE_SHEET_ID"])
+
+def get_apify_service() -> ApifyService:
+    """Returns the process-wide ApifyService, creating it on first use."""
+    global _apify_service
+    with _apify_service_lock:
+        if _apify_service is None:
+            _apify_service = ApifyService(os.environ["APIFY_API_TOKEN"])
+        return _apify_service
 
 EXPECTED_HEADERS = [
     'employmentType', 'companyName', 'companyCountry', 'companyWebsite', 'postedAt', 'phones', 'emails',
@@ -31,9 +126,57 @@ EXPECTED_HEADERS = [
     'tiktok', 'pinterest', 'discord', settings.EMAIL_STATUS_COLUMN, settings.WHATSAPP_STATUS_COLUMN
 ]
 
+def _job_field(key: str):
+    return lambda job, contact_info, country: job.get(key, '')
+
+def _contact_field(key: str):
+    return lambda job, contact_info, country: contact_info.get(key, '')
+
+def _constant(value: str):
+    return lambda job, contact_info, country: value
+
+# How each sheet column is filled from (job, contact_info, country); columns not listed stay blank
+_ROW_FIELDS = {
+    'employmentType': _job_field('employment_type'), 'companyName': _job_field('company_name'),
+    'companyCountry': lambda job, contact_info, country: country,
+    'postedAt': _job_field('posted_datetime'), 'phones': _contact_field('phones'),
+    'emails': _contact_field('emails'), 'title': _job_field('title'),
+    'linkedin': _contact_field('linkedin'), 'link': _job_field('job_url'),
+    'fullCompanyAddress': lambda job, contact_info, country: f"{job.get('company_street', '')}, {job.get('company_locality', '')}",
+    'twitter': _contact_field('twitter'), 'instagram': _contact_field('instagram'),
+    'facebook': _contact_field('facebook'), 'youtube': _contact_field('youtube'),
+    'tiktok': _contact_field('tiktok'), 'pinterest': _contact_field('pinterest'),
+    'discord': _contact_field('discord'),
+    settings.EMAIL_STATUS_COLUMN: _constant(settings.PENDING_STATUS),
+    settings.WHATSAPP_STATUS_COLUMN: _constant(settings.PENDING_STATUS),
+}
+# One builder per column, in EXPECTED_HEADERS order, so a row is built in a single pass
+HEADER_BUILDERS = [_ROW_FIELDS.get(header, _constant('')) for header in EXPECTED_HEADERS]
+
 # ==============================================================================
 # MODULE 1: DATA SCRAPING LOGIC (Unaltered)
 # ==============================================================================
+# Number of contact-scraper actor runs kept in flight at once
+CONTACT_SCRAPER_WORKERS = settings.CONTACT_SCRAPER_CONCURRENCY
+_STREAM_DONE = object()
+# Scraped rows are appended to the sheet in batches of this size (and at the end of each search batch)
+ROW_APPEND_BATCH_SIZE = 50
+_LINK_COLUMN = EXPECTED_HEADERS.index('link')
+
+def _batch_searches(job_combinations: list, batch_size: int) -> list:
+    """
+    Groups job/country combinations into (country, [jobs]) batches of at most batch_size jobs.
+    Batches never mix countries, so every job a batch returns can be saved under its country.
+    """
+    jobs_by_country = {}
+    for combo in job_combinations:
+        jobs_by_country.setdefault(combo['country'], []).append(combo['job'])
+    return [
+        (country, jobs[i:i + batch_size])
+        for country, jobs in jobs_by_country.items()
+        for i in range(0, len(jobs), batch_size)
+    ]
+
 def run_scraping_logic(task_id: str, job_combinations: list, max_results: int, proxy_type: str):
     """
     Initiates the data scraping process. This logic is unchanged and works as intended.
@@ -43,260 +186,419 @@ def run_scraping_logic(task_id: str, job_combinations: list, max_results: int, p
     logger.info(f"Task [{task_id}]: Starting scraping for {total_combinations} combinations.")
 
     try:
-        sheets_service = GoogleSheetsService(os.environ["GOOGLE_SERVICE_ACCOUNT_PATH"], os.environ["GOOGLE_SHEET_ID"])
+        sheets_service = get_sheets_service()
         worksheet = sheets_service.get_worksheet("Sheet1")
         header_map = sheets_service.get_header_map(worksheet)
         link_col_index = header_map.get('link')
         if not link_col_index: raise Exception("Column 'link' not found in the Google Sheet.")
-        existing_links = sheets_service.get_column_values(worksheet, link_col_index)
-        apify_service = ApifyService(os.environ["APIFY_API_TOKEN"])
+        # Links are compared in normalized form so trailing slashes or host casing don't hide duplicates
+        existing_links = JobLinkIndex(sheets_service.get_columns(worksheet, [link_col_index])[0], settings.LINK_BLOOM_FILTER_THRESHOLD)
+        apify_service = get_apify_service()
     except Exception as e:
         error_message = f"Initialization failed: {e}"
-        with tasks_lock:
-            tasks_status[task_id].update({'status': 'failed', 'error': error_message, 'finished_at': datetime.utcnow()})
+        _update_task_status(task_id, status='failed', error=error_message, finished_at=datetime.utcnow())
         return
 
-    for i, combo in enumerate(job_combinations):
-        with tasks_lock:
-            tasks_status[task_id]['progress'] = f"Processing combination {i+1}/{total_combinations}: '{combo['job']}' in '{combo['country']}'"
+    # One event loop for the whole task, so all combinations share the same HTTP/2 connections
+    asyncio.run(_scrape_combinations(task_id, job_combinations, max_results, proxy_type, sheets_service, worksheet, existing_links, apify_service))
 
-        search_url = build_linkedin_url(keyword=combo['job'], location_name=combo['country'])
-        
-        # ============================================================================
-        # MEMORY-OPTIMIZED STREAMING APPROACH
-        # ============================================================================
-        # Instead of loading all jobs into memory, we process them one-by-one
-        # as they're fetched from Apify. This prevents RAM exhaustion on large datasets.
-        # ============================================================================
-        logger.info(f"Task [{task_id}]: Starting STREAMING scrape for '{combo['job']}' in '{combo['country']}'")
-        logger.info(f"Task [{task_id}]: Jobs will be processed incrementally as they're found")
-        
-        jobs_processed = 0
-        
-        # Stream jobs one at a time from LinkedIn scraper
-        for job in apify_service.run_linkedin_job_scraper_streaming(
-            search_url=search_url,
-            max_results=max_results,
-            proxy_group=proxy_type,
-            memory_mbytes=512,
-            max_concurrency=1  # Keep concurrency at 1 to avoid rate limiting
-        ):
+    _update_task_status(task_id, status='completed', progress=f"Completed all {total_combinations} combinations.", finished_at=datetime.utcnow())
+    logger.info(f"Task [{task_id}]: Scraping finished.")
+
+async def _scrape_combinations(task_id: str, job_combinations: list, max_results: int, proxy_type: str,
+                               sheets_service: GoogleSheetsService, worksheet, existing_links: JobLinkIndex, apify_service: ApifyService):
+    """
+    Runs the streaming scrape for every job/country combination in turn.
+    """
+    batches = _batch_searches(job_combinations, settings.LINKEDIN_SEARCH_BATCH_SIZE)
+    total_batches = len(batches)
+    pending_rows = []
+
+    def flush_rows():
+        """Appends the buffered rows in one request; on failure their links are released for a retry."""
+        if not pending_rows:
+            return
+        try:
+            sheets_service.batch_append_rows(worksheet, pending_rows, value_input_option="RAW", insert_data_option="INSERT_ROWS")
+            logger.info(f"Task [{task_id}]: 💾 Appended {len(pending_rows)} row(s) to Google Sheets")
+        except Exception as e:
+            existing_links.difference_update(normalize_job_link(row[_LINK_COLUMN]) for row in pending_rows)
+            logger.error(f"Task [{task_id}]: Failed to append {len(pending_rows)} row(s): {e}. Continuing.")
+        pending_rows.clear()
+
+    async with ApifyAsyncService(os.environ["APIFY_API_TOKEN"]) as apify_async:
+        for i, (country, keywords) in enumerate(batches):
+            search_label = f"{', '.join(repr(k) for k in keywords)} in '{country}'"
+            _update_task_status(task_id, progress=f"Processing search batch {i+1}/{total_batches}: {search_label}")
+
+            search_urls = [build_linkedin_url(keyword=keyword, location_name=country) for keyword in keywords]
+            
+            # ============================================================================
+            # MEMORY-OPTIMIZED STREAMING APPROACH
+            # ============================================================================
+            # Instead of loading all jobs into memory, we process them as they're
+            # fetched from Apify, scraping several companies' contacts concurrently.
+            # ============================================================================
+            logger.info(f"Task [{task_id}]: Starting STREAMING scrape for {search_label}")
+            logger.info(f"Task [{task_id}]: Jobs will be processed incrementally as they're found")
+
+            def save_job(job: dict, contact_info: dict, country: str = country):
+                pending_rows.append([build(job, contact_info, country) for build in HEADER_BUILDERS])
+                if len(pending_rows) >= ROW_APPEND_BATCH_SIZE:
+                    flush_rows()
+
+            # Stream jobs from the LinkedIn scraper into the concurrent contact-scraping pipeline
+            jobs = apify_service.run_linkedin_job_scraper_streaming(
+                search_urls=search_urls,
+                max_results=max_results,
+                proxy_group=proxy_type,
+                memory_mbytes=512,
+                max_concurrency=1  # Keep concurrency at 1 to avoid rate limiting
+            )
             try:
-                job_link = job.get('job_url')
+                jobs_processed = await process_jobs_streaming(task_id, apify_async, jobs, existing_links, save_job)
+            finally:
+                # Jobs saved before a failed stream still reach the sheet
+                await asyncio.to_thread(flush_rows)
+            
+            # Summary for this combination
+            logger.info("")
+            logger.info(f"Task [{task_id}]: ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            logger.info(f"Task [{task_id}]: ✅ Search batch {i+1}/{total_batches} COMPLETED")
+            logger.info(f"Task [{task_id}]:    Search: {search_label}")
+            logger.info(f"Task [{task_id}]:    Jobs processed: {jobs_processed}")
+            logger.info(f"Task [{task_id}]: ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            logger.info("")
+
+async def process_jobs_streaming(task_id: str, apify_async: ApifyAsyncService, jobs, existing_links: JobLinkIndex, save_job, workers: int = CONTACT_SCRAPER_WORKERS) -> int:
+    """
+    Scrapes contact details for a stream of LinkedIn jobs with `workers` concurrent actor runs.
+    The blocking job generator is drained on a thread into a bounded queue, and new jobs are
+    handed one at a time to save_job(job, contact_info). Jobs from the same domain share one
+    contact lookup, even while it is still running. Returns the number of jobs saved.
+    """
+    queue = asyncio.Queue(maxsize=2 * workers)
+    save_lock = asyncio.Lock()
+    jobs_saved = 0
+
+    async def produce():
+        job_iter = iter(jobs)
+        try:
+            while (job := await asyncio.to_thread(next, job_iter, _STREAM_DONE)) is not _STREAM_DONE:
+                # Only the duplicate check uses the normalized link; the sheet keeps the scraped URL
+                job_link = normalize_job_link(job.get('job_url'))
                 if not job_link or job_link in existing_links:
                     continue
-
-                contact_info = {}
-                company_website = job.get('company_website')
-                if company_website:
-                    logger.info(f"Task [{task_id}]: Scraping contact details for {job.get('company_name', 'Unknown')} - {company_website}")
-                    
-                    # Call contact scraper with optimized settings
-                    contact_results = apify_service.run_contact_detail_scraper(
-                        website_url=company_website,
-                        memory_mbytes=512,
-                        max_concurrency=1,
-                        max_depth=2,
-                        max_requests=5
-                    )
-                    
-                    if contact_results:
-                        contact_info = process_contact_data(contact_results, job)
-                        logger.info(f"Task [{task_id}]: Found {len(contact_info.get('emails', '').split(','))} email(s) and {len(contact_info.get('phones', '').split(','))} phone(s)")
-                    else:
-                        logger.warning(f"Task [{task_id}]: No contact details found for {company_website}")
-                    
-                    # Small delay between contact scrapes to avoid rate limiting
-                    time.sleep(2)
-
-                row_data = {
-                    'employmentType': job.get('employment_type', ''), 'companyName': job.get('company_name', ''),
-                    'companyCountry': combo['country'],
-                    'postedAt': job.get('posted_datetime', ''), 'phones': contact_info.get('phones', ''),
-                    'emails': contact_info.get('emails', ''), 'title': job.get('title', ''),
-                    'linkedin': contact_info.get('linkedin', ''), 'link': job.get('job_url', ''),
-                    'fullCompanyAddress': f"{job.get('company_street', '')}, {job.get('company_locality', '')}",
-                    'twitter': contact_info.get('twitter', ''), 'instagram': contact_info.get('instagram', ''),
-                    'facebook': contact_info.get('facebook', ''), 'youtube': contact_info.get('youtube', ''),
-                    'tiktok': contact_info.get('tiktok', ''), 'pinterest': contact_info.get('pinterest', ''),
-                    'discord': contact_info.get('discord', ''),
-                    settings.EMAIL_STATUS_COLUMN: settings.PENDING_STATUS,
-                    settings.WHATSAPP_STATUS_COLUMN: settings.PENDING_STATUS,
-                }
-                new_row = [row_data.get(header, '') for header in EXPECTED_HEADERS]
-                sheets_service.append_row(worksheet, new_row)
+                # Claim the link now so a duplicate later in the stream is not scraped twice
                 existing_links.add(job_link)
-                jobs_processed += 1
+                await queue.put(job)
+        finally:
+            for _ in range(workers):
+                await queue.put(_STREAM_DONE)
+
+    # domain -> in-flight or finished contact lookup, so jobs from one employer share a single actor run
+    contact_lookups: dict[str, asyncio.Task] = {}
+
+    async def lookup_contact_info(job: dict, company_website: str) -> dict:
+        # The cache may be Redis, so its round-trips run on a thread instead of stalling every consumer
+        cached_contact_info = await asyncio.to_thread(get_cached_contact_info, company_website)
+        if cached_contact_info is not None:
+            logger.info(f"Task [{task_id}]: ♻️  Using cached contact details for {company_website}")
+            return cached_contact_info
+
+        logger.info(f"Task [{task_id}]: Scraping contact details for {job.get('company_name', 'Unknown')} - {company_website}")
+
+        # Call contact scraper with optimized settings
+        contact_results = await apify_async.run_contact_detail_scraper(
+            website_url=company_website,
+            memory_mbytes=512,
+            max_concurrency=1,
+            max_depth=2,
+            max_requests=5
+        )
+
+        if not contact_results:
+            logger.warning(f"Task [{task_id}]: No contact details found for {company_website}")
+            return {}
+        contact_info = process_contact_data(contact_results, job)
+        await asyncio.to_thread(cache_contact_info, company_website, contact_info)
+        logger.info(f"Task [{task_id}]: Found {len(contact_info.get('emails', '').split(','))} email(s) and {len(contact_info.get('phones', '').split(','))} phone(s)")
+        return contact_info
+
+    async def get_contact_info(job: dict, company_website: str) -> dict:
+        domain = normalize_domain(company_website)
+        lookup = contact_lookups.get(domain)
+        if lookup is None:
+            lookup = contact_lookups[domain] = asyncio.create_task(lookup_contact_info(job, company_website))
+        try:
+            # Shielded so one cancelled consumer does not cancel the lookup the others are awaiting
+            return await asyncio.shield(lookup)
+        except Exception:
+            # A failed lookup is retried by the next job from this domain
+            if contact_lookups.get(domain) is lookup:
+                del contact_lookups[domain]
+            raise
+
+    async def consume():
+        nonlocal jobs_saved
+        while (job := await queue.get()) is not _STREAM_DONE:
+            try:
+                company_website = job.get('company_website')
+                contact_info = await get_contact_info(job, company_website) if company_website else {}
+
+                # Rows are buffered and appended one batch at a time, off the event loop
+                async with save_lock:
+                    await asyncio.to_thread(save_job, job, contact_info)
+                jobs_saved += 1
+                await asyncio.to_thread(_increment_task_processed, task_id)
                 
-                logger.info(f"Task [{task_id}]: ✅ Job #{jobs_processed} saved: {job.get('title', 'Unknown')} at {job.get('company_name', 'Unknown')}")
+                logger.info(f"Task [{task_id}]: ✅ Job #{jobs_saved} saved: {job.get('title', 'Unknown')} at {job.get('company_name', 'Unknown')}")
             except Exception as e:
+                existing_links.discard(normalize_job_link(job.get('job_url')))
                 logger.error(f"Task [{task_id}]: Error processing job '{job.get('title')}': {e}. Continuing.")
-                continue
-        
-        # Summary for this combination
-        logger.info("")
-        logger.info(f"Task [{task_id}]: ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        logger.info(f"Task [{task_id}]: ✅ Combination {i+1}/{total_combinations} COMPLETED")
-        logger.info(f"Task [{task_id}]:    Search: '{combo['job']}' in '{combo['country']}'")
-        logger.info(f"Task [{task_id}]:    Jobs processed: {jobs_processed}")
-        logger.info(f"Task [{task_id}]: ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        logger.info("")
-        
-        # Add a small delay between job combinations to avoid rate limiting
-        if i < total_combinations - 1:  # Don't delay after the last combination
-            delay_seconds = 5
-            logger.info(f"Task [{task_id}]: ⏸️  Waiting {delay_seconds} seconds before next search combination...")
-            time.sleep(delay_seconds)
-
-    with tasks_lock:
-        tasks_status[task_id].update({'status': 'completed', 'progress': f"Completed all {total_combinations} combinations.", 'finished_at': datetime.utcnow()})
-    logger.info(f"Task [{task_id}]: Scraping finished.")
+
+    # Consumers handle their own errors, so a failure here is the job stream breaking off. It is
+    # raised only after the consumers have drained the queue, so no claimed job is left half-done.
+    results = await asyncio.gather(produce(), *(consume() for _ in range(workers)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return jobs_saved
 
 # ==============================================================================
 # MODULE 2: SEQUENTIAL EMAIL CAMPAIGN LOGIC (Rewritten)
 # ==============================================================================
+# Status cells are written in batches: when this many are queued or this many seconds have passed
+STATUS_FLUSH_SIZE = 20
+STATUS_FLUSH_INTERVAL = 5
+# Prebuilt separator lines for the campaign logs
+_BANNER = "=" * 100
+_BAR = "━" * 100
+# Google Sheets rejects cells longer than this many characters
+SHEETS_CELL_LIMIT = 50000
+_TRUNCATION_MARKER = "... (truncated)]"
+
+def _final_status(sent_count: int, sender_count: int, status_messages: list) -> str:
+    """Builds a target's summary status cell, truncated to fit in a single Sheets cell."""
+    final_status = "Completed: Sent %d/%d. Details: [%s]" % (sent_count, sender_count, ', '.join(status_messages))
+    if len(final_status) > SHEETS_CELL_LIMIT:
+        final_status = final_status[:SHEETS_CELL_LIMIT - len(_TRUNCATION_MARKER)] + _TRUNCATION_MARKER
+    return final_status
+
+# Inboxino attachment IDs are temporary; an uploaded resume is reused for this many seconds
+ATTACHMENT_REUSE_TTL = 30 * 60
+
+def _load_sender_resumes(senders: list) -> dict:
+    """
+    Loads each sender's resume once at campaign start, keyed by filename.
+    Missing files are logged and left out, so their sends fail without touching the disk again.
+    """
+    resumes = {}
+    for filename in {sender.get('resume_filename') for sender in senders if sender.get('resume_filename')}:
+        try:
+            resumes[filename] = load_resume(filename)
+        except FileNotFoundError:
+            logger.error(f"❌ Resume file '{filename}' not found in the project root.")
+    return resumes
+
+def _status_journal(worksheet, status_column: str) -> StatusJournal:
+    """
+    Opens the status journal of one status column. The scope names the spreadsheet and the
+    worksheet by ID, so leftovers from another sheet (or a renamed tab) are never replayed here.
+    """
+    return StatusJournal(settings.CAMPAIGN_STATE_DB, f"{worksheet.spreadsheet.id}:{worksheet.id}:{status_column}")
+
+def _contact_row_key(contact_values: list):
+    """
+    Returns a StatusWriter row_key: the contact cell of a sheet row (data starts on row 2).
+    """
+    return lambda row: str(contact_values[row - 2]) if 2 <= row < len(contact_values) + 2 else ''
+
 def run_email_campaign_logic(task_id: str):
     """
-    Executes a sequential email campaign. For each target, it iterates through a
-    pre-defined sequence of senders (with unique resumes/subjects) from the Senders Pool.
+    Executes an email campaign. For each target, every sender in a pre-defined sequence
+    (with unique resumes/subjects) from the Senders Pool sends concurrently.
     """
-    logger.info("=" * 100)
-    logger.info(f"📧 EMAIL CAMPAIGN STARTED - Task ID: {task_id}")
-    logger.info("=" * 100)
+    logger.info(_BANNER)
+    logger.info("📧 EMAIL CAMPAIGN STARTED - Task ID: %s", task_id)
+    logger.info(_BANNER)
     
+    rate_limiter = None
     try:
         logger.info("🔧 Initializing Email Campaign Services...")
-        sheets_service = GoogleSheetsService(os.environ["GOOGLE_SERVICE_ACCOUNT_PATH"], os.environ["GOOGLE_SHEET_ID"])
+        sheets_service = get_sheets_service()
         rate_limiter = RateLimiterService(sheets_service)
 
         logger.info("📋 Loading target recipients from Google Sheets...")
         worksheet = sheets_service.get_worksheet("Sheet1")
-        all_data = sheets_service.get_all_values(worksheet)
-        header_map = {header.strip(): i for i, header in enumerate(all_data[0])}
+        header_map = sheets_service.get_header_map(worksheet)
 
         email_col = header_map.get(settings.EMAIL_COLUMN_NAME)
         status_col = header_map.get(settings.EMAIL_STATUS_COLUMN)
-        if email_col is None or status_col is None:
+        if not email_col or not status_col:
             raise Exception("Email or email_status columns not found in the sheet.")
+        # Only the two columns the campaign reads are downloaded
+        email_values, status_values = sheets_service.get_columns(worksheet, [email_col, status_col])
 
         # Get the sequence of senders from the Senders Pool
         email_sequence = rate_limiter.get_senders_by_type('email')
         if not email_sequence:
             raise Exception("No active email senders found in the 'Senders Pool' sheet.")
 
+        resumes = _load_sender_resumes(email_sequence)
+        # Usage only grows during a campaign, so availability is re-checked only after a sender sends
+        availability = {sender['id']: rate_limiter.is_sender_available('email', sender['id']) for sender in email_sequence if sender.get('id')}
+
+        # Opening the journal can fail too (read-only disk, locked database), so it is part of initialization
+        status_writer = StatusWriter(
+            sheets_service, worksheet, STATUS_FLUSH_SIZE, STATUS_FLUSH_INTERVAL,
+            journal=_status_journal(worksheet, settings.EMAIL_STATUS_COLUMN), row_key=_contact_row_key(email_values)
+        )
+
     except Exception as e:
         error_message = f"Initialization failed: {e}"
-        logger.error(f"❌ Campaign initialization failed: {e}")
-        with tasks_lock:
-            tasks_status[task_id].update({'status': 'failed', 'error': error_message, 'finished_at': datetime.utcnow()})
+        logger.error("❌ Campaign initialization failed: %s", e)
+        _update_task_status(task_id, status='failed', error=error_message, finished_at=datetime.utcnow())
+        if rate_limiter is not None:
+            # Drops its atexit hook, which would otherwise keep this limiter alive until shutdown
+            rate_limiter.close()
         return
 
-    # Find all targets (rows) that are pending
-    targets_to_process = [(i, row) for i, row in enumerate(all_data) if i > 0 and row[status_col] == settings.PENDING_STATUS]
-    total_targets = len(targets_to_process)
+    # Find all targets (rows) that are pending: only their sheet row numbers are kept (data starts on row 2)
+    # Rows whose status a previous run journaled but never wrote are already done
+    journaled_rows = status_writer.queued_rows(status_col)
+    pending_indices = [
+        row for row, row_status in enumerate(status_values, 2)
+        if row_status == settings.PENDING_STATUS and row not in journaled_rows
+    ]
+    total_targets = len(pending_indices)
     
-    logger.info("=" * 100)
-    logger.info(f"📊 CAMPAIGN OVERVIEW")
-    logger.info(f"   Total pending targets: {total_targets}")
-    logger.info(f"   Available senders: {len(email_sequence)}")
-    logger.info(f"   Sends per target: {len(email_sequence)} (sequential)")
-    logger.info(f"   Maximum total sends: {total_targets * len(email_sequence)}")
-    logger.info("=" * 100)
+    logger.info(_BANNER)
+    logger.info("📊 CAMPAIGN OVERVIEW")
+    logger.info("   Total pending targets: %s", total_targets)
+    logger.info("   Available senders: %s", len(email_sequence))
+    logger.info("   Sends per target: %s (concurrent)", len(email_sequence))
+    logger.info("   Maximum total sends: %s", total_targets * len(email_sequence))
+    logger.info(_BANNER)
 
     # --- Main loop iterates over TARGETS ---
-    for target_count, (row_index, target_row) in enumerate(targets_to_process, 1):
-        logger.info("")
-        logger.info("━" * 100)
-        logger.info(f"🎯 TARGET {target_count}/{total_targets}")
-        logger.info("━" * 100)
-        
-        with tasks_lock:
-            tasks_status[task_id]['progress'] = f"Processing Target {target_count}/{total_targets}"
-
-        target_emails_str = target_row[email_col]
-        if not target_emails_str:
-            logger.warning(f"⚠️  No email found for target {target_count}")
-            sheets_service.update_cell(worksheet, row_index + 1, status_col + 1, "No Email Found")
-            continue
-
-        valid_emails = [e.strip() for e in target_emails_str.split(',') if e.strip() and '@' in e]
-        if not valid_emails:
-            logger.warning(f"⚠️  No valid email found for target {target_count}")
-            sheets_service.update_cell(worksheet, row_index + 1, status_col + 1, "No Valid Email")
-            continue
-
-        recipient = valid_emails[0]
-        logger.info(f"📬 Recipient: {recipient}")
-        logger.info(f"📋 Will attempt sequential sends using {len(email_sequence)} sender(s)")
+    send_executor = ThreadPoolExecutor(max_workers=len(email_sequence), thread_name_prefix='email-send')
+
+    try:
+        for target_count, row_number in enumerate(pending_indices, 1):
+            target_cell = email_values[row_number - 2]
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("")
+                logger.info(_BAR)
+                logger.info("🎯 TARGET %s/%s", target_count, total_targets)
+                logger.info(_BAR)
         
-        sent_count_for_target = 0
-        final_status_messages = []
-
-        # --- Inner loop iterates over the SENDER SEQUENCE for EACH target ---
-        for sender_index, sender_config in enumerate(email_sequence, 1):
-            sender_id = sender_config.get('id')
-            if not sender_id:
-                logger.warning("⚠️  Skipping a sender in sequence due to missing ID.")
+            _update_task_status(task_id, progress=f"Processing Target {target_count}/{total_targets}")
+
+            target_emails_str = target_cell
+            if not target_emails_str:
+                logger.warning("⚠️  No email found for target %s", target_count)
+                status_writer.queue(row_number, status_col, "No Email Found")
                 continue
 
-            logger.info("")
-            logger.info(f"   → Sender #{sender_index}: {sender_id}")
+            valid_emails = [e.strip() for e in target_emails_str.split(',') if e.strip() and '@' in e]
+            if not valid_emails:
+                logger.warning("⚠️  No valid email found for target %s", target_count)
+                status_writer.queue(row_number, status_col, "No Valid Email")
+                continue
+
+            recipient = valid_emails[0]
+            logger.info("📬 Recipient: %s", recipient)
+            logger.info("📋 Will attempt concurrent sends using %s sender(s)", len(email_sequence))
+        
+            sent_count_for_target = 0
+            final_status_messages = []
+            # (sender_id, SendResult or pending send) in sequence order
+            sender_results = []
+
+            # --- Inner loop iterates over the SENDER SEQUENCE for EACH target ---
+            # Sends from different senders are independent, so they run on the pool at the same time
+            for sender_index, sender_config in enumerate(email_sequence, 1):
+                sender_id = sender_config.get('id')
+                if not sender_id:
+                    logger.warning("⚠️  Skipping a sender in sequence due to missing ID.")
+                    continue
+
+                logger.info("")
+                logger.info("   → Sender #%s: %s", sender_index, sender_id)
             
-            # Check if this specific sender is available (has not hit its daily limit)
-            is_available = rate_limiter.is_sender_available('email', sender_id)
+                # Check if this specific sender is available (has not hit its daily limit)
+                is_available = availability.get(sender_id, False)
 
-            if is_available:
-                resume = sender_config.get('resume_filename', 'N/A')
-                subject = sender_config.get('email_subject', 'N/A')
+                if is_available:
+                    resume_filename = sender_config.get('resume_filename')
+                    subject = sender_config.get('email_subject', 'N/A')
                 
-                logger.info(f"      📧 Preparing email...")
-                logger.info(f"         From: {sender_id}")
-                logger.info(f"         To: {recipient}")
-                logger.info(f"         Resume: {resume}")
-                logger.info(f"         Subject: {subject}")
-                logger.info(f"      🚀 Sending email...")
-
-                # Send email with the specific resume and subject for this sender
-                status_msg = send_email(
-                    recipient_email=recipient,
-                    sender_config=sender_config,
-                    resume_filename=sender_config.get('resume_filename'),
-                    subject=sender_config.get('email_subject')
-                )
-
-                final_status_messages.append(status_msg)
-
-                if "Sent via" in status_msg:
-                    logger.info(f"      ✅ SUCCESS - Email sent from {sender_id} to {recipient}")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("      📧 Preparing email...")
+                        logger.info("         From: %s", sender_id)
+                        logger.info("         To: %s", recipient)
+                        logger.info("         Resume: %s", resume_filename or 'N/A')
+                        logger.info("         Subject: %s", subject)
+                        logger.info("      🚀 Sending email...")
+
+                    resume = resumes.get(resume_filename)
+                    if resume_filename and resume is None:
+                        result = SendResult(False, f"Failed: Attachment '{resume_filename}' not found")
+                        logger.error("      ❌ FAILED - %s", result.detail)
+                        sender_results.append((sender_id, result))
+                    else:
+                        # Send email with the preloaded resume and subject for this sender
+                        sender_results.append((sender_id, send_executor.submit(
+                            send_email,
+                            recipient_email=recipient,
+                            sender_config=sender_config,
+                            resume=resume,
+                            subject=sender_config.get('email_subject')
+                        )))
+                else:
+                    logger.warning("      ⏸️  SKIPPED - Sender rate-limited")
+                    sender_results.append((sender_id, SendResult(False, f"Skipped: {sender_id} rate-limited")))
+
+            # Rate-limiter bookkeeping stays on this thread, in sender order
+            for sender_id, pending in sender_results:
+                result = pending.result() if isinstance(pending, Future) else pending
+                final_status_messages.append(result.detail)
+
+                if result.ok:
+                    logger.info("      ✅ SUCCESS - Email sent from %s to %s", sender_id, recipient)
                     rate_limiter.log_send(sender_id, recipient, 'email')
+                    availability[sender_id] = rate_limiter.is_sender_available('email', sender_id)
                     sent_count_for_target += 1
-                else:
-                    logger.error(f"      ❌ FAILED - {status_msg}")
-            else:
-                status_msg = f"Skipped: {sender_id} rate-limited"
-                logger.warning(f"      ⏸️  SKIPPED - Sender rate-limited")
-                final_status_messages.append(status_msg)
-
-        # After iterating through all senders for this target, update the master status in the sheet
-        logger.info("")
-        logger.info(f"📊 SUMMARY for {recipient}:")
-        logger.info(f"   Successful sends: {sent_count_for_target}/{len(email_sequence)}")
-        logger.info(f"   Status messages: {final_status_messages}")
+                elif isinstance(pending, Future):
+                    logger.error("      ❌ FAILED - %s", result.detail)
+
+            # After iterating through all senders for this target, update the master status in the sheet
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("")
+                logger.info("📊 SUMMARY for %s:", recipient)
+                logger.info("   Successful sends: %s/%s", sent_count_for_target, len(email_sequence))
+                logger.info("   Status messages: %s", final_status_messages)
         
-        final_status = f"Completed: Sent {sent_count_for_target}/{len(email_sequence)}. Details: [{', '.join(final_status_messages)}]"
-        sheets_service.update_cell(worksheet, row_index + 1, status_col + 1, final_status)
-        logger.info(f"   💾 Status updated in Google Sheets")
-        logger.info("━" * 100)
+            final_status = _final_status(sent_count_for_target, len(email_sequence), final_status_messages)
+            status_writer.queue(row_number, status_col, final_status)
+            _increment_task_processed(task_id)
+            logger.info("   💾 Status queued for Google Sheets")
+            logger.info(_BAR)
+    finally:
+        # Queued statuses and send logs are written even if the loop stops early
+        send_executor.shutdown(wait=True)
+        status_writer.close()
+        rate_limiter.close()
 
     logger.info("")
-    logger.info("=" * 100)
+    logger.info(_BANNER)
     logger.info("🎉 EMAIL CAMPAIGN COMPLETED")
-    logger.info(f"   Task ID: {task_id}")
-    logger.info(f"   Total targets processed: {total_targets}")
-    logger.info("=" * 100)
+    logger.info("   Task ID: %s", task_id)
+    logger.info("   Total targets processed: %s", total_targets)
+    logger.info(_BANNER)
     
-    with tasks_lock:
-        tasks_status[task_id].update({'status': 'completed', 'progress': 'Email campaign finished.', 'finished_at': datetime.utcnow()})
+    _update_task_status(task_id, status='completed', progress='Email campaign finished.', finished_at=datetime.utcnow())
 
 # ==============================================================================
 # MODULE 3: SEQUENTIAL WHATSAPP CAMPAIGN LOGIC (COMPLETELY NEW)
@@ -306,145 +608,206 @@ def run_whatsapp_campaign_logic(task_id: str):
     Executes a sequential WhatsApp campaign, similar to the email campaign.
     For each target, it iterates through the WhatsApp sender sequence.
     """
-    logger.info("=" * 100)
-    logger.info(f"💬 WHATSAPP CAMPAIGN STARTED - Task ID: {task_id}")
-    logger.info("=" * 100)
+    logger.info(_BANNER)
+    logger.info("💬 WHATSAPP CAMPAIGN STARTED - Task ID: %s", task_id)
+    logger.info(_BANNER)
     
+    rate_limiter = None
     try:
         logger.info("🔧 Initializing WhatsApp Campaign Services...")
-        sheets_service = GoogleSheetsService(os.environ["GOOGLE_SERVICE_ACCOUNT_PATH"], os.environ["GOOGLE_SHEET_ID"])
+        sheets_service = get_sheets_service()
         rate_limiter = RateLimiterService(sheets_service)
 
         logger.info("📋 Loading target recipients from Google Sheets...")
         worksheet = sheets_service.get_worksheet("Sheet1")
-        all_data = sheets_service.get_all_values(worksheet)
-        header_map = {header.strip(): i for i, header in enumerate(all_data[0])}
+        header_map = sheets_service.get_header_map(worksheet)
 
         phone_col = header_map.get(settings.PHONE_COLUMN_NAME)
         status_col = header_map.get(settings.WHATSAPP_STATUS_COLUMN)
 
-        if phone_col is None or status_col is None:
+        if not phone_col or not status_col:
             raise Exception("Phone or whatsapp_status columns not found in the sheet.")
+        # Only the two columns the campaign reads are downloaded
+        phone_values, status_values = sheets_service.get_columns(worksheet, [phone_col, status_col])
 
         whatsapp_sequence = rate_limiter.get_senders_by_type('whatsapp')
         if not whatsapp_sequence:
             raise Exception("No active WhatsApp senders found in 'Senders Pool'.")
 
+        # Validate sender configs once instead of for every target
+        complete_senders = []
+        for sender_config in whatsapp_sequence:
+            if sender_config.get('id') and sender_config.get('api_key') and sender_config.get('resume_filename'):
+                complete_senders.append(sender_config)
+            else:
+                logger.warning("⚠️  Skipping WhatsApp sender '%s' due to missing config", sender_config.get('id'))
+        whatsapp_sequence = complete_senders
+        if not whatsapp_sequence:
+            raise Exception("No WhatsApp sender in 'Senders Pool' has an id, api_key and resume_filename.")
+
+        resumes = _load_sender_resumes(whatsapp_sequence)
+        # Usage only grows during a campaign, so availability is re-checked only after a sender sends
+        availability = {sender['id']: rate_limiter.is_sender_available('whatsapp', sender['id']) for sender in whatsapp_sequence}
+
+        # Opening the journal can fail too (read-only disk, locked database), so it is part of initialization
+        status_writer = StatusWriter(
+            sheets_service, worksheet, STATUS_FLUSH_SIZE, STATUS_FLUSH_INTERVAL,
+            journal=_status_journal(worksheet, settings.WHATSAPP_STATUS_COLUMN), row_key=_contact_row_key(phone_values)
+        )
+
     except Exception as e:
         error_message = f"Initialization failed: {e}"
-        logger.error(f"❌ Campaign initialization failed: {e}")
-        with tasks_lock:
-            tasks_status[task_id].update({'status': 'failed', 'error': error_message, 'finished_at': datetime.utcnow()})
+        logger.error("❌ Campaign initialization failed: %s", e)
+        _update_task_status(task_id, status='failed', error=error_message, finished_at=datetime.utcnow())
+        if rate_limiter is not None:
+            # Drops its atexit hook, which would otherwise keep this limiter alive until shutdown
+            rate_limiter.close()
         return
 
-    targets_to_process = [(i, row) for i, row in enumerate(all_data) if i > 0 and row[status_col] == settings.PENDING_STATUS]
-    total_targets = len(targets_to_process)
+    # Only the sheet row numbers of pending targets are kept (data starts on row 2)
+    # Rows whose status a previous run journaled but never wrote are already done
+    journaled_rows = status_writer.queued_rows(status_col)
+    pending_indices = [
+        row for row, row_status in enumerate(status_values, 2)
+        if row_status == settings.PENDING_STATUS and row not in journaled_rows
+    ]
+    total_targets = len(pending_indices)
     
-    logger.info("=" * 100)
-    logger.info(f"📊 CAMPAIGN OVERVIEW")
-    logger.info(f"   Total pending targets: {total_targets}")
-    logger.info(f"   Available senders: {len(whatsapp_sequence)}")
-    logger.info(f"   Sends per target: {len(whatsapp_sequence)} (sequential)")
-    logger.info(f"   Maximum total sends: {total_targets * len(whatsapp_sequence)}")
-    logger.info("=" * 100)
-
-    for target_count, (row_index, target_row) in enumerate(targets_to_process, 1):
-        logger.info("")
-        logger.info("━" * 100)
-        logger.info(f"🎯 TARGET {target_count}/{total_targets}")
-        logger.info("━" * 100)
-        
-        with tasks_lock:
-            tasks_status[task_id]['progress'] = f"Processing WhatsApp Target {target_count}/{total_targets}"
-
-        phones_str = target_row[phone_col]
-        if not phones_str:
-            logger.warning(f"⚠️  No phone found for target {target_count}")
-            sheets_service.update_cell(worksheet, row_index + 1, status_col + 1, "No Phone Found")
-            continue
-
-        phone_numbers = list(set(f"+{p.strip()}" for p in phones_str.split(',') if p.strip().isdigit()))
-        if not phone_numbers:
-            logger.warning(f"⚠️  No valid phone found for target {target_count}")
-            sheets_service.update_cell(worksheet, row_index + 1, status_col + 1, "No Valid Phone")
-            continue
-        
-        logger.info(f"📱 Recipient(s): {', '.join(phone_numbers)}")
-        logger.info(f"📋 Will attempt sequential sends using {len(whatsapp_sequence)} sender(s)")
+    logger.info(_BANNER)
+    logger.info("📊 CAMPAIGN OVERVIEW")
+    logger.info("   Total pending targets: %s", total_targets)
+    logger.info("   Available senders: %s", len(whatsapp_sequence))
+    logger.info("   Sends per target: %s (sequential)", len(whatsapp_sequence))
+    logger.info("   Maximum total sends: %s", total_targets * len(whatsapp_sequence))
+    logger.info(_BANNER)
+
+    # (api_key, resume filename) -> (attachment id, monotonic expiry)
+    attachment_ids = {}
+    # sender id -> (attachment id, send function); a sender is rebuilt only when its attachment changes
+    whatsapp_senders = {}
+
+    try:
+        for target_count, row_number in enumerate(pending_indices, 1):
+            target_cell = phone_values[row_number - 2]
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("")
+                logger.info(_BAR)
+                logger.info("🎯 TARGET %s/%s", target_count, total_targets)
+                logger.info(_BAR)
         
-        sent_count_for_target = 0
-        final_status_messages = []
+            _update_task_status(task_id, progress=f"Processing WhatsApp Target {target_count}/{total_targets}")
 
-        for sender_index, sender_config in enumerate(whatsapp_sequence, 1):
-            sender_id = sender_config.get('id')
-            api_key = sender_config.get('api_key')
-            resume_file = sender_config.get('resume_filename')
+            phones_str = target_cell
+            if not phones_str:
+                logger.warning("⚠️  No phone found for target %s", target_count)
+                status_writer.queue(row_number, status_col, "No Phone Found")
+                continue
 
-            if not all([sender_id, api_key, resume_file]):
-                logger.warning(f"⚠️  Skipping WhatsApp sender '{sender_id}' due to missing config")
+            # Dedupe in sheet order so logs and status details are stable between runs
+            phone_numbers = list(dict.fromkeys(f"+{phone}" for phone in (p.strip() for p in phones_str.split(',')) if phone.isdigit()))
+            if not phone_numbers:
+                logger.warning("⚠️  No valid phone found for target %s", target_count)
+                status_writer.queue(row_number, status_col, "No Valid Phone")
                 continue
+        
+            logger.info("📱 Recipient(s): %s", ', '.join(phone_numbers))
+            logger.info("📋 Will attempt sequential sends using %s sender(s)", len(whatsapp_sequence))
+        
+            sent_count_for_target = 0
+            final_status_messages = []
 
-            logger.info("")
-            logger.info(f"   → Sender #{sender_index}: {sender_id}")
+            for sender_index, sender_config in enumerate(whatsapp_sequence, 1):
+                sender_id = sender_config.get('id')
+                api_key = sender_config.get('api_key')
+                resume_file = sender_config.get('resume_filename')
+
+                logger.info("")
+                logger.info("   → Sender #%s: %s", sender_index, sender_id)
             
-            is_available = rate_limiter.is_sender_available('whatsapp', sender_id)
-
-            if is_available:
-                logger.info(f"      💬 Preparing WhatsApp message...")
-                logger.info(f"         From Account: {sender_id}")
-                logger.info(f"         To: {', '.join(phone_numbers)}")
-                logger.info(f"         Resume File: {resume_file}")
-                logger.info(f"      📤 Uploading resume to Inboxino...")
-                
-                # For WhatsApp, the attachment must be uploaded for each send to get a temporary ID
-                attachment_id = upload_file_to_inboxino(api_key, resume_file)
+                is_available = availability.get(sender_id, False)
+
+                if is_available:
+                    resume = resumes.get(resume_file)
+                    if resume is None:
+                        status_msg = f"Failed: Attachment '{resume_file}' not found"
+                        logger.error("      ❌ FAILED - %s", status_msg)
+                        final_status_messages.append(status_msg)
+                        continue
+
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("      💬 Preparing WhatsApp message...")
+                        logger.info("         From Account: %s", sender_id)
+                        logger.info("         To: %s", ', '.join(phone_numbers))
+                        logger.info("         Resume File: %s", resume_file)
+
+                    # Attachment IDs are temporary, so a resume is re-uploaded once its cached ID gets old
+                    upload_key = (api_key, resume_file)
+                    cached_upload = attachment_ids.get(upload_key)
+                    if cached_upload and cached_upload[1] > time.monotonic():
+                        attachment_id = cached_upload[0]
+                        logger.info("      ♻️  Reusing uploaded resume (Attachment Path: %s)", attachment_id)
+                    else:
+                        logger.info("      📤 Uploading resume to Inboxino...")
+                        attachment_id = upload_file_to_inboxino(api_key, resume)
+                        if attachment_id:
+                            attachment_ids[upload_key] = (attachment_id, time.monotonic() + ATTACHMENT_REUSE_TTL)
                 
-                if attachment_id:
-                    logger.info(f"      ✅ Resume uploaded successfully")
-                    logger.info(f"      🚀 Sending WhatsApp message...")
+                    if attachment_id:
+                        logger.info("      ✅ Resume attachment ready")
+                        logger.info("      🚀 Sending WhatsApp message...")
                     
-                    status_msg = send_whatsapp_message(
-                        phone_numbers_to_send=phone_numbers,
-                        attachment_file_id=attachment_id,
-                        sender_config=sender_config,
-                        resume_filename=resume_file
-                    )
+                        cached_sender = whatsapp_senders.get(sender_id)
+                        if cached_sender and cached_sender[0] == attachment_id:
+                            send = cached_sender[1]
+                        else:
+                            send = make_whatsapp_sender(sender_config, attachment_id, resume)
+                            whatsapp_senders[sender_id] = (attachment_id, send)
+                        result = send(phone_numbers)
+                        status_msg = result.detail
                     
-                    if "Sent via" in status_msg:
-                        logger.info(f"      ✅ SUCCESS - WhatsApp sent from {sender_id} to {', '.join(phone_numbers)}")
-                        rate_limiter.log_send(sender_id, ','.join(phone_numbers), 'whatsapp')
-                        sent_count_for_target += 1
+                        if result.ok:
+                            logger.info("      ✅ SUCCESS - WhatsApp sent from %s to %s", sender_id, ', '.join(phone_numbers))
+                            rate_limiter.log_send(sender_id, ','.join(phone_numbers), 'whatsapp')
+                            availability[sender_id] = rate_limiter.is_sender_available('whatsapp', sender_id)
+                            sent_count_for_target += 1
+                        else:
+                            # The attachment may have expired early; upload afresh next time
+                            attachment_ids.pop(upload_key, None)
+                            logger.error("      ❌ FAILED - %s", status_msg)
                     else:
-                        logger.error(f"      ❌ FAILED - {status_msg}")
-                else:
-                    status_msg = f"Failed: Upload error for {resume_file}"
-                    logger.error(f"      ❌ FAILED - Could not upload resume to Inboxino")
+                        status_msg = f"Failed: Upload error for {resume_file}"
+                        logger.error("      ❌ FAILED - Could not upload resume to Inboxino")
                 
-                final_status_messages.append(status_msg)
-            else:
-                status_msg = f"Skipped: {sender_id} rate-limited"
-                logger.warning(f"      ⏸️  SKIPPED - Sender rate-limited")
-                final_status_messages.append(status_msg)
-
-        logger.info("")
-        logger.info(f"📊 SUMMARY for {', '.join(phone_numbers)}:")
-        logger.info(f"   Successful sends: {sent_count_for_target}/{len(whatsapp_sequence)}")
-        logger.info(f"   Status messages: {final_status_messages}")
+                    final_status_messages.append(status_msg)
+                else:
+                    status_msg = f"Skipped: {sender_id} rate-limited"
+                    logger.warning("      ⏸️  SKIPPED - Sender rate-limited")
+                    final_status_messages.append(status_msg)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("")
+                logger.info("📊 SUMMARY for %s:", ', '.join(phone_numbers))
+                logger.info("   Successful sends: %s/%s", sent_count_for_target, len(whatsapp_sequence))
+                logger.info("   Status messages: %s", final_status_messages)
         
-        final_status = f"Completed: Sent {sent_count_for_target}/{len(whatsapp_sequence)}. Details: [{', '.join(final_status_messages)}]"
-        sheets_service.update_cell(worksheet, row_index + 1, status_col + 1, final_status)
-        logger.info(f"   💾 Status updated in Google Sheets")
-        logger.info("━" * 100)
+            final_status = _final_status(sent_count_for_target, len(whatsapp_sequence), final_status_messages)
+            status_writer.queue(row_number, status_col, final_status)
+            _increment_task_processed(task_id)
+            logger.info("   💾 Status queued for Google Sheets")
+            logger.info(_BAR)
+    finally:
+        # Queued statuses and send logs are written even if the loop stops early
+        status_writer.close()
+        rate_limiter.close()
 
     logger.info("")
-    logger.info("=" * 100)
+    logger.info(_BANNER)
     logger.info("🎉 WHATSAPP CAMPAIGN COMPLETED")
-    logger.info(f"   Task ID: {task_id}")
-    logger.info(f"   Total targets processed: {total_targets}")
-    logger.info("=" * 100)
+    logger.info("   Task ID: %s", task_id)
+    logger.info("   Total targets processed: %s", total_targets)
+    logger.info(_BANNER)
     
-    with tasks_lock:
-        tasks_status[task_id].update({'status': 'completed', 'progress': 'WhatsApp campaign finished.', 'finished_at': datetime.utcnow()})
+    _update_task_status(task_id, status='completed', progress='WhatsApp campaign finished.', finished_at=datetime.utcnow())
 
 # ==============================================================================
 # FRONTEND VIEW CLASSES
@@ -477,6 +840,9 @@ class TaskTrackerPageView(View):
 # ==============================================================================
 # API VIEW CLASSES
 # ==============================================================================
+def _tasks_saturated_response() -> Response:
+    return Response({"error": "Too many tasks are running or queued. Please try again later."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
 class StartScrapingView(APIView):
     """API endpoint to start the data scraping process."""
     def post(self, request):
@@ -488,16 +854,16 @@ class StartScrapingView(APIView):
         if not countries or not jobs:
             return Response({"error": "'country' and 'job' fields are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        job_combinations = [{'country': c, 'job': j} for c in (countries if isinstance(countries, list) else [countries]) for j in (jobs if isinstance(jobs, list) else [jobs]) if c and j]
+        countries = countries if isinstance(countries, list) else [countries]
+        jobs = jobs if isinstance(jobs, list) else [jobs]
+        job_combinations = [{'country': c, 'job': j} for c, j in itertools.product(filter(None, countries), filter(None, jobs))]
         if not job_combinations:
             return Response({"error": "No valid country/job combinations provided."}, status=status.HTTP_400_BAD_REQUEST)
 
         task_id = str(uuid.uuid4())
-        with tasks_lock:
-            tasks_status[task_id] = {'type': 'Scraping', 'status': 'queued', 'progress': 'Waiting to start...', 'started_at': datetime.utcnow()}
-
-        thread = threading.Thread(target=run_scraping_logic, args=(task_id, job_combinations, max_results, proxy_type))
-        thread.start()
+        task_info = {'type': 'Scraping', 'status': 'queued', 'progress': 'Waiting to start...', 'started_at': datetime.utcnow()}
+        if not _submit_task(task_id, task_info, run_scraping_logic, job_combinations, max_results, proxy_type):
+            return _tasks_saturated_response()
 
         return Response({"message": "Scraping task has been successfully started.", "task_id": task_id}, status=status.HTTP_202_ACCEPTED)
 
@@ -505,11 +871,9 @@ class StartEmailCampaignView(APIView):
     """API endpoint to start the email sending campaign."""
     def post(self, request):
         task_id = str(uuid.uuid4())
-        with tasks_lock:
-            tasks_status[task_id] = {'type': 'Email Campaign', 'status': 'queued', 'progress': 'Waiting to start...', 'started_at': datetime.utcnow()}
-
-        thread = threading.Thread(target=run_email_campaign_logic, args=(task_id,))
-        thread.start()
+        task_info = {'type': 'Email Campaign', 'status': 'queued', 'progress': 'Waiting to start...', 'started_at': datetime.utcnow()}
+        if not _submit_task(task_id, task_info, run_email_campaign_logic):
+            return _tasks_saturated_response()
 
         return Response({"message": "Email campaign has been successfully started.", "task_id": task_id}, status=status.HTTP_202_ACCEPTED)
 
@@ -517,19 +881,40 @@ class StartWhatsappCampaignView(APIView):
     """API endpoint to start the WhatsApp sending campaign."""
     def post(self, request):
         task_id = str(uuid.uuid4())
-        with tasks_lock:
-            tasks_status[task_id] = {'type': 'WhatsApp Campaign', 'status': 'queued', 'progress': 'Waiting to start...'}
-
-        thread = threading.Thread(target=run_whatsapp_campaign_logic, args=(task_id,))
-        thread.start()
+        task_info = {'type': 'WhatsApp Campaign', 'status': 'queued', 'progress': 'Waiting to start...'}
+        if not _submit_task(task_id, task_info, run_whatsapp_campaign_logic):
+            return _tasks_saturated_response()
 
         return Response({"message": "WhatsApp campaign has been successfully started.", "task_id": task_id}, status=status.HTTP_202_ACCEPTED)
 
+# Finished tasks never change again, so their final status is kept in an immutable snapshot that
+# status polls read without a lock or a cache round-trip; writers publish a new snapshot under the lock.
+FINISHED_TASKS_KEPT = 1000
+_finished_tasks = MappingProxyType({})
+_finished_tasks_lock = threading.Lock()
+
+def _publish_finished_task(task_id: str, payload: dict):
+    global _finished_tasks
+    with _finished_tasks_lock:
+        finished = dict(_finished_tasks)
+        finished[task_id] = MappingProxyType(payload)
+        # Keep only the most recently finished tasks
+        for old_task_id in list(finished)[:max(0, len(finished) - FINISHED_TASKS_KEPT)]:
+            del finished[old_task_id]
+        _finished_tasks = MappingProxyType(finished)
+
 class TaskStatusView(APIView):
     """API endpoint to check the status of a running task."""
     def get(self, request, task_id):
-        with tasks_lock:
-            task_info = tasks_status.get(task_id)
+        payload = _finished_tasks.get(task_id)
+        if payload is not None:
+            return Response(dict(payload), status=status.HTTP_200_OK)
+
+        cached = cache.get_many([_task_key(task_id), _task_key(task_id, 'processed')])
+        task_info = cached.get(_task_key(task_id))
         if not task_info:
             return Response({"error": "Task ID not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(task_info.copy(), status=status.HTTP_200_OK)
\ No newline at end of file
+        payload = {**task_info, 'processed': cached.get(_task_key(task_id, 'processed'), 0)}
+        if payload.get('status') in ('completed', 'failed'):
+            _publish_finished_task(task_id, payload)
+        return Response(payload, status=status.HTTP_200_OK)
\ No newline at end of file